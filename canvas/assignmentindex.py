@@ -0,0 +1,67 @@
+from canvasapi.assignment import Assignment
+
+class AssignmentIndex:
+
+  # The kinds of assignment graders and revisers choose from.
+  CATEGORIES = {
+    'receptacle': lambda a: (getattr(a, 'grading_type', None) == 'points'
+      and getattr(a, 'submission_types', None) == ['none']
+      and not getattr(a, 'is_quiz_assignment', False)),
+    'quiz': lambda a: (getattr(a, 'published', False)
+      and getattr(a, 'is_quiz_assignment', False)
+      and getattr(a, 'grading_type', None) == 'points'),
+  }
+
+  # Mastery assignments are chosen from the same pool as receptacles.
+  CATEGORIES['mastery'] = CATEGORIES['receptacle']
+
+  def __init__(self, assignments = ()) -> None:
+    self.by_id = {}
+    self.by_name = {}
+    self.categories = {category: {} for category in self.CATEGORIES}
+    self.sorted = {}
+
+    for assignment in assignments:
+      self.add(assignment)
+
+
+  def add(self, assignment: Assignment) -> None:
+    # Adding an assignment again, such as after an edit, re-files it.
+    self.remove(assignment.id)
+
+    self.by_id[assignment.id] = assignment
+    self.by_name[getattr(assignment, 'name', None)] = assignment
+    for category, belongs in self.CATEGORIES.items():
+      if belongs(assignment):
+        self.categories[category][assignment.id] = assignment
+
+    self.sorted = {}
+
+
+  def remove(self, id) -> None:
+    assignment = self.by_id.pop(id, None)
+    if not assignment:
+      return
+
+    if self.by_name.get(getattr(assignment, 'name', None)) is assignment:
+      del self.by_name[getattr(assignment, 'name', None)]
+    for members in self.categories.values():
+      members.pop(id, None)
+
+    self.sorted = {}
+
+
+  def get(self, id) -> Assignment:
+    return self.by_id.get(id)
+
+
+  def find(self, name: str) -> Assignment:
+    return self.by_name.get(name)
+
+
+  def list(self, category: str = None) -> list:
+    # Menus list assignments by name. Sorting happens once per change.
+    if category not in self.sorted:
+      members = self.categories[category] if category else self.by_id
+      self.sorted[category] = sorted(members.values(), key=lambda a: getattr(a, 'name', None) or '')
+    return self.sorted[category]
@@ -0,0 +1,74 @@
+import asyncio
+import functools
+
+from concurrent.futures import ThreadPoolExecutor
+
+class AsyncClient:
+
+  def __init__(self, course_manager) -> None:
+    self.course_manager = course_manager
+
+    # Blocking canvasapi calls run on worker threads, so every request still
+    # goes through the pooled session, its rate limiter and retry policy.
+    # The limiter, not the worker count, decides what is actually in flight.
+    self.executor = ThreadPoolExecutor(max_workers=course_manager.session.limiter.maximum)
+
+
+  async def run(self, func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+
+  async def gather(self, *awaitables, return_exceptions = False) -> list:
+    return await asyncio.gather(*awaitables, return_exceptions=return_exceptions)
+
+
+  async def list(self, paginated) -> list:
+    # Walk a canvasapi PaginatedList to the end.
+    return await self.run(list, paginated)
+
+
+  async def create_question(self, quiz, question: dict):
+    return await self.run(quiz.create_question, question=question)
+
+
+  async def edit_question(self, question, data: dict):
+    return await self.run(question.edit, question=data)
+
+
+  async def delete_question(self, question):
+    return await self.run(question.delete)
+
+
+  async def create_questions(self, quiz, questions: list, skip = (), done = None) -> dict:
+    # Positions are fixed up front, so questions keep their order however the
+    # requests finish. Failures are returned by position rather than raised.
+    async def create(position, question):
+      result = await self.create_question(quiz, {**question, 'position': position})
+      if done:
+        done(position, result)
+      return result
+
+    positions = [i for i in range(1, len(questions) + 1) if i not in skip]
+    results = await self.gather(*[create(i, questions[i - 1]) for i in positions], return_exceptions=True)
+    return dict(zip(positions, results))
+
+
+  async def create_rubric(self, course, rubric: dict, rubric_association: dict) -> dict:
+    return await self.run(course.create_rubric, rubric=rubric, rubric_association=rubric_association)
+
+
+  async def create_override(self, assignment, assignment_override: dict):
+    return await self.run(assignment.create_override, assignment_override=assignment_override)
+
+
+  async def submissions_bulk_update(self, assignment, grade_data: dict):
+    return await self.run(assignment.submissions_bulk_update, grade_data=grade_data)
+
+
+  async def post_grades(self, assignment_id, graded_only = False) -> dict:
+    return await self.run(self.course_manager.post_grades, assignment_id, graded_only=graded_only)
+
+
+  def close(self) -> None:
+    self.executor.shutdown(wait=False)
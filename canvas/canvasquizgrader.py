@@ -1,5 +1,7 @@
 import canvas.grader
 
+from canvas.paginator import Paginator
+from canvas.projections import SubmissionScore
 from canvasapi.assignment import Assignment
 from canvas.cli import confirm, menu, number
 
@@ -48,34 +50,48 @@ class CanvasQuizGrader(canvas.grader.Grader):
 
 
   def get_quiz(self) -> Assignment:
+    if quiz := self.resume_assignment('quiz'):
+      return quiz
+
     # Select an existing assignment.
-    quizzes = [a for a in self.get_assignments()
-      if a.published and a.is_quiz_assignment and a.grading_type == 'points']
+    quizzes = self.get_assignments('quiz')
 
     index = menu('\nSelect quiz:', list(map(str, quizzes)))
     print('\nQuiz:', quizzes[index])
     print()
 
+    self.journal.record('quiz', quizzes[index].id)
+
     return quizzes[index]
 
 
   def get_scores(self, receptacle: Assignment):
-    submissions = [s for s in receptacle.get_submissions()
-      if getattr(s, 'score', None) is not None and s.graded_at]
+    # Reuse submissions fetched before an interruption.
+    if 'submissions' in self.journal:
+      return [SubmissionScore(s) for s in self.journal.get('submissions')]
+
+    submissions = list(Paginator(receptacle.get_submissions(), project=SubmissionScore,
+      where=lambda s: s.score is not None and s.graded_at))
 
     # Validate submissions.
     if not submissions:
       print('That quiz has no submissions! Please select another.')
+      self.journal.record('quiz', None)
       return
 
     print(f'Found {len(submissions)} submissions.')
 
+    self.journal.record('submissions', [s.as_dict() for s in submissions])
+
     return submissions
 
 
   def get_rubric(self, receptacle: Assignment):
     mastery = self.get_mastery(receptacle)
 
+    if 'rubric' in self.journal:
+      return mastery, self.journal.get('rubric')
+
     settings = getattr(mastery, 'rubric_settings', {})
     rubric = getattr(mastery, 'rubric', None)
 
@@ -88,7 +104,7 @@ class CanvasQuizGrader(canvas.grader.Grader):
     if not rubric or replace_rubric:
       rubric = self.apply_rubric(mastery)
 
-    return mastery, rubric[0]
+    return mastery, self.journal.record('rubric', rubric[0])
 
 
   def apply_rubric(self, mastery: Assignment):
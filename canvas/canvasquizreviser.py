@@ -4,6 +4,7 @@ import canvas.grader
 from os import path
 from tkinter import Tk
 from canvas.cli import menu
+from canvas.paginator import Paginator
 from canvasapi.assignment import Assignment
 from tkinter.filedialog import asksaveasfilename
 
@@ -44,8 +45,7 @@ class CanvasQuizReviser(canvas.grader.Grader):
 
   def get_quiz(self) -> Assignment:
     # Select an existing assignment.
-    quizzes = [a for a in self.get_assignments()
-      if a.published and a.is_quiz_assignment and a.grading_type == 'points']
+    quizzes = self.get_assignments('quiz')
 
     index = menu('\nSelect quiz:', list(map(str, quizzes)))
     print('\nQuiz:', quizzes[index])
@@ -55,7 +55,7 @@ class CanvasQuizReviser(canvas.grader.Grader):
 
 
   def get_submissions(self, quiz: Assignment):
-    submissions = [s for s in quiz.get_submissions(include=['submission_comments'])
+    submissions = [s for s in Paginator(quiz.get_submissions(include=['submission_comments']), lazy=True)
       if getattr(s, 'score', None) is not None and s.graded_at and s.submission_comments]
 
     # Validate submissions.
@@ -8,7 +8,6 @@ from os import path
 from tkinter import Tk
 from dateutil.tz import gettz
 from canvasapi.quiz import Quiz
-from collections import Counter
 from dateutil.parser import parse
 from canvasapi.exceptions import BadRequest
 from tkinter.filedialog import askopenfilename
@@ -37,8 +36,47 @@ class CanvasQuizScheduler(canvas.grader.Grader):
   def do_checkpoints(self) -> None:
     print('Now assigning Canvas checkpoint opportunities')
 
-    quiz = self.get_quiz(check_unpublished=False)
+    # Selections made before an interruption are reused.
+    if quiz_id := self.journal.get('quiz'):
+      quiz = self.course.get_quiz(quiz_id)
+      print('\nQuiz (resumed):', quiz)
+    else:
+      quiz = self.get_quiz(check_unpublished=False)
+      self.journal.record('quiz', quiz.id)
 
+    if 'eligible' in self.journal:
+      eligible_students = self.journal.get('eligible')
+    else:
+      eligible_students = self.journal.record('eligible', self.get_eligible_students())
+
+    print(f'Found {len(eligible_students)} students eligible for the checkpoint.')
+    print()
+
+    if not self.journal.get('assigned'):
+      self.assign_checkpoint(quiz, eligible_students)
+      self.journal.record('assigned', True)
+
+    if getattr(quiz, 'time_limit', None) and not self.journal.get('extensions'):
+      self.assign_extra_time(quiz, eligible_students)
+      self.journal.record('extensions', True)
+
+    # Publish quiz.
+    publish = confirm('Publish quiz? ')
+
+    quiz.edit(quiz={
+      'only_visible_to_overrides': True,
+      'published': publish,
+    })
+
+    if publish:
+      print(f'Published quiz {quiz.title}.')
+
+    self.journal.clear()
+
+    print('\nDone.')
+
+
+  def get_eligible_students(self) -> list:
     outcome = self.get_learning_outcome()
 
     checks = number(
@@ -49,22 +87,21 @@ class CanvasQuizScheduler(canvas.grader.Grader):
     print()
 
     # Find students with full scores on outcome opportunities.
-    scored_users = [int(o.links['user'])
-      for o in self.course.get_outcome_results()
-        if o.links['learning_outcome'] == str(getattr(outcome, 'id', None))
-          and o.score and int(o.score) >= 3]
+    results = self.course_manager.get_outcome_results(self.course)
+    scores = pd.to_numeric(results['score']).fillna(0).astype(int)
+    scored = results[(results['outcome_id'] == str(getattr(outcome, 'id', None))) & (scores >= 3)]
 
     # Find students who meet the previously specified number of checks.
-    mastered_users = [user for user, count in Counter(scored_users).items() if count >= checks]
+    counts = scored['user_id'].value_counts()
+    mastered_users = set(counts[counts >= checks].index)
 
-    students = self.course.get_users(enrollment_type=['student'])
+    students = self.course_manager.paginate(self.course, 'users')
 
-    eligible_students = [s for s in students
+    return [s.id for s in students
       if getattr(s, 'email', None) and s.id not in mastered_users]
 
-    print(f'Found {len(eligible_students)} students eligible for the checkpoint.')
-    print()
 
+  def assign_checkpoint(self, quiz: Quiz, students: list) -> None:
     due_iso = None
 
     # Set revision due date.
@@ -90,7 +127,7 @@ class CanvasQuizScheduler(canvas.grader.Grader):
       assignment.create_override(assignment_override={
         'due_at': due_iso,
         'lock_at': due_iso,
-        'student_ids': [s.id for s in eligible_students],
+        'student_ids': students,
       })
     except BadRequest:
       print('\nCannot make student-specific assignments if overrides already exist.')
@@ -100,25 +137,9 @@ class CanvasQuizScheduler(canvas.grader.Grader):
       'only_visible_to_overrides': True,
     })
 
-    print(f'\nAssigned checkpoint to {len(eligible_students)} students.')
+    print(f'\nAssigned checkpoint to {len(students)} students.')
     print()
 
-    if getattr(quiz, 'time_limit', None):
-      self.assign_extra_time(quiz, eligible_students)
-
-    # Publish quiz.
-    publish = confirm('Publish quiz? ')
-
-    quiz.edit(quiz={
-      'only_visible_to_overrides': True,
-      'published': publish,
-    })
-
-    if publish:
-      print(f'Published quiz {quiz.title}.')
-
-    print('\nDone.')
-
 
   def assign_extra_time(self, quiz: Quiz, students: list = None) -> None:
     accommodations = None
@@ -160,7 +181,7 @@ class CanvasQuizScheduler(canvas.grader.Grader):
     passes_unpublished = lambda q: not q.published if check_unpublished else True
 
     # Select an existing assignment.
-    quizzes = sorted([q for q in self.course.get_quizzes()
+    quizzes = sorted([q for q in self.course_manager.paginate(self.course, 'quizzes')
       if q.quiz_type == 'assignment' and passes_limit(q) and passes_unpublished(q)],
       key=lambda q: getattr(q, 'title', None))
 
@@ -178,7 +199,7 @@ class CanvasQuizScheduler(canvas.grader.Grader):
 
   def get_learning_outcome(self):
     outcomes_unsorted = {outcome['id']: outcome.get('title', outcome.get('display_name', ''))
-      for link in self.course.get_all_outcome_links_in_context()
+      for link in self.course_manager.get_outcome_links(self.course)
         if (outcome := getattr(link, 'outcome'))}
 
     if not outcomes_unsorted:
@@ -225,15 +246,14 @@ class CanvasQuizScheduler(canvas.grader.Grader):
     # Drop the test student.
     df_data.drop(df_data[df_data['School ID'] == 'X889900'].index, inplace=True)
 
-    users = students or self.course.get_users(enrollment_type=['student'])
-
-    # Retrieve users.
-    users = {user.email: user.id for user in users if getattr(user, 'email', None)}
+    # Map emails to Canvas user IDs and set the index to match.
+    df_mapped = self.course_manager.get_roster(self.course).join(df_data, on='Email')
 
-    df_users = pd.DataFrame.from_dict(users, orient='index', columns=['user_id'])
+    # Keep only the given student IDs, if any.
+    if students:
+      df_mapped = df_mapped[df_mapped.index.isin(students)]
 
-    # Map emails to Canvas user IDs and set the index to match.
-    return df_data.join(df_users, on='Email', how='inner').set_index('user_id')
+    return df_mapped
 
 
   def get_applicable_accommodations(self, accommodations: pd.DataFrame):
@@ -1,3 +1,5 @@
+import os
+
 from os import path
 from canvas.cli import error, info, text
 from configparser import ConfigParser
@@ -9,6 +11,8 @@ class ConfigManager:
   CORE = 'core'
   CONFIG_FILE = '.canvas-toolkit-config'
 
+  DATA_DIR = '.canvas-toolkit'
+
   config_path = path.join(path.expanduser('~'), CONFIG_FILE)
 
   def __init__(self) -> None:
@@ -47,6 +51,59 @@ class ConfigManager:
       # CRITICAL, FATAL, ERROR, WARNING, INFO, DEBUG.
       'canvas_log_dir': path.expanduser('~'),
       'canvas_log_level': 'ERROR',
+
+      # Log files rotate once they reach the maximum size in
+      # megabytes, keeping the given number of older files. The
+      # format can be text, or json for one structured object per line.
+      'canvas_log_max_size': 10,
+      'canvas_log_backups': 3,
+      'canvas_log_format': 'text',
+
+      # Connection pooling for Canvas API requests. The pool size
+      # is the number of keep-alive connections held per host, and
+      # HTTP/2 is only used if the optional h2 package is installed.
+      'canvas_pool_size': 10,
+      'canvas_http2': False,
+
+      # The most Canvas API requests allowed in flight at once. The
+      # actual number adapts to the X-Rate-Limit-Remaining header.
+      'canvas_max_in_flight': 8,
+
+      # How many times to attempt a request that fails transiently,
+      # such as when Canvas is throttling or a gateway times out.
+      'canvas_retry_attempts': 5,
+
+      # A path to the directory where caches and other local data
+      # will be stored, and how many seconds a validated access
+      # token may be reused before Canvas is asked to check it again.
+      'canvas_data_dir': path.join(path.expanduser('~'), self.DATA_DIR),
+      'canvas_session_ttl': 900,
+
+      # Whether to keep Canvas API responses on disk in the data
+      # directory, revalidating them with ETags, and the largest
+      # size of that cache in megabytes.
+      'canvas_http_cache': False,
+      'canvas_http_cache_size': 100,
+
+      # The JSON parser for Canvas API responses, which can be one
+      # of: auto, orjson, json. Auto uses orjson when installed.
+      'canvas_json_decoder': 'auto',
+
+      # Seconds for which a course mirror made with `canvas sync`
+      # answers reads instead of Canvas. Set to 0 to never use it.
+      'canvas_mirror_max_age': 900,
+
+      # Seconds before an outcome in the shared outcome catalog is
+      # revalidated with Canvas.
+      'canvas_outcome_ttl': 86400,
+
+      # Seconds for which a course's student roster is reused from
+      # disk before it is listed from Canvas again.
+      'canvas_roster_ttl': 900,
+
+      # Whether to load course data in the background while grading
+      # and revision menus wait for a selection.
+      'canvas_prefetch': True,
     }
 
     self.save()
@@ -54,8 +111,11 @@ class ConfigManager:
     info(f'Generated global configuration file at {self.config_path}')
 
 
-  def get(self, address: str) -> str:
+  def get(self, address: str, fallback: str = None) -> str:
     section, key = self.split_address(address)
+    # Entries added after installation may be missing from older files.
+    if fallback is not None:
+      return self.config.get(section, key, fallback=fallback)
     return self.config.get(section, key)
 
 
@@ -65,6 +125,13 @@ class ConfigManager:
     self.save()
 
 
+  def get_data_path(self, *parts: str) -> str:
+    default = path.join(path.expanduser('~'), self.DATA_DIR)
+    directory = path.join(self.get('canvas_data_dir', fallback=default), *parts)
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
   def get_courses(self) -> list[str]:
     return [section for section in self.config.sections()
       if section != self.CORE and '.' not in section]
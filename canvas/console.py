@@ -2,6 +2,7 @@ import click
 import functools
 
 from canvas.cli import error, info
+from canvas.responsecache import ResponseCache
 from canvas import ConfigManager, GradingManager
 
 config_manager = ConfigManager()
@@ -43,6 +44,35 @@ def install():
   config_manager.install()
 
 
+###########################################################################
+# Cache commands
+###########################################################################
+
+@cli.group
+def cache():
+  """Manage the on-disk Canvas response cache."""
+  pass
+
+
+def get_response_cache() -> ResponseCache:
+  size = float(config_manager.get('canvas_http_cache_size', fallback='100'))
+  return ResponseCache(config_manager.get_data_path(), max_size=int(size * 1024 * 1024))
+
+
+@cache.command
+def stats():
+  """Show response cache statistics."""
+  for key, value in get_response_cache().stats().items():
+    info(f'{key}: {value}')
+
+
+@cache.command
+def clear():
+  """Remove all cached responses."""
+  get_response_cache().clear()
+  info('Cleared response cache.')
+
+
 ###########################################################################
 # Course commands
 ###########################################################################
@@ -101,9 +131,10 @@ def course_name_argument(func):
 
 @cli.command
 @course_name_argument
-def assign():
+@click.option('--resume', is_flag=True, help='Continue the last interrupted session.')
+def assign(resume):
   """Assign checkpoint opportunities for given Canvas course."""
-  grading_manager.start_opportunities()
+  grading_manager.start_opportunities(resume)
 
 
 @cli.command
@@ -115,16 +146,18 @@ def export():
 
 @cli.command
 @course_name_argument
-def grade():
+@click.option('--resume', is_flag=True, help='Continue the last interrupted session.')
+def grade(resume):
   """Perform grading for given Canvas course."""
-  grading_manager.start_grading()
+  grading_manager.start_grading(resume)
 
 
 @cli.command
 @course_name_argument
-def revise():
+@click.option('--resume', is_flag=True, help='Continue the last interrupted session.')
+def revise(resume):
   """Assign revisions for given Canvas course."""
-  grading_manager.start_revisions()
+  grading_manager.start_revisions(resume)
 
 
 @cli.command
@@ -134,6 +167,21 @@ def rubrics():
   grading_manager.generate_single_outcome_rubrics()
 
 
+@cli.command
+@course_name_argument
+def sync():
+  """Mirror course data locally for faster reads."""
+  grading_manager.sync_course()
+
+
+@cli.command
+@course_name_argument
+@click.option('--period', type=click.Choice(['month', 'quarter', 'year']), default='month', help='Length of each trend period.')
+def trends(period):
+  """Export outcome mastery trends from synced course data."""
+  grading_manager.export_outcome_trends(period)
+
+
 @cli.command
 @course_name_argument
 def sds():
@@ -1,13 +1,34 @@
 import re
 import math
+import time
 import getpass
 import keyring
-import logging
+import threading
+import pandas as pd
 
 from os import path
 from canvasapi import Canvas
+from concurrent.futures import ThreadPoolExecutor
 from canvasapi.course import Course, Folder
+from canvasapi.content_migration import ContentMigration
+from canvas import logsetup
 from canvas.configcourse import ConfigCourse
+from canvas.paginator import Paginator
+from canvas.asyncclient import AsyncClient
+from canvas.coursemirror import CourseMirror
+from canvas.outcomehistory import OutcomeHistory
+from canvas.projections import OutcomeScore
+from canvas.rosterindex import RosterIndex
+from canvas.sessionjournal import SessionJournal
+from canvas.rubricregistry import RubricRegistry
+from canvas.outcomecatalog import OutcomeCatalog
+from canvas.questionmap import QuestionMap
+from canvas.scorecache import ScoreCache
+from canvas.figureregistry import FigureRegistry
+from canvas.quizsync import QuizSync
+from canvas.sessionpool import session_pool
+from canvas.sessioncache import SessionCache
+from canvas.responsecache import ResponseCache
 from canvasapi.exceptions import Forbidden, InvalidAccessToken, ResourceDoesNotExist, Unauthorized
 
 class CourseManager:
@@ -15,33 +36,32 @@ class CourseManager:
   def __init__(self, config: ConfigCourse) -> None:
     self.course = config
     self.config = self.course.manager
+    self.mirrors = {}
+    self.rosters = {}
+    self.outcome_links = {}
+    self.rubric_registries = {}
 
-    if self.config.get('canvas_keyring_disable').lower() == 'true':
-      return self._init_without_keyring()
+    # The prefetcher fills these from several threads, so each one is
+    # filled under its own lock and fetched only once.
+    self.locks = {name: threading.Lock() for name in ['mirrors', 'rosters', 'outcome_links', 'rubric_registries']}
 
-    keyring_name = self.config.get('canvas_keyring_name')
-    keyring_user = self.config.get('canvas_keyring_user')
+    # Set up logging once per process, before any requests are made.
+    logsetup.configure(self.config)
 
-    token = keyring.get_password(keyring_name, keyring_user)
+    self.url = self.config.get('canvas_url').rstrip('/')
 
-    if token:
-      try:
-        self._connect(token)
-        return
-      except InvalidAccessToken:
-        print('Invalid Canvas access token.')
-        pass
-
-    # Fall back to config value if possible, or ask the user for input otherwise.
-    token = self.config.get('canvas_api_token') or getpass.getpass('Enter new Canvas access token:')
+    # The token in the config is always used as is, so it is never cached.
+    keyring_disabled = self.config.get('canvas_keyring_disable').lower() == 'true'
+    self.session_cache = SessionCache(
+      self.config.get_data_path(),
+      ttl=0 if keyring_disabled else int(self.config.get('canvas_session_ttl', fallback='900')),
+    )
 
-    try:
-      self._connect(token)
-      keyring.set_password(keyring_name, keyring_user, token)
-      print('Access token saved.')
+    # Reuse a recently validated token without the keyring or a round trip.
+    if self._connect_from_cache():
       return
-    except InvalidAccessToken:
-      raise KeyError('Invalid Canvas access token. Try again.')
+
+    self._authenticate()
 
 
   def get_course(self, course_id = None) -> Course:
@@ -52,6 +72,12 @@ class CourseManager:
 
     try:
       return self.canvas.get_course(id)
+    except InvalidAccessToken:
+      # A cached token is only checked again once Canvas rejects it.
+      if not self.unverified:
+        raise
+      self._revalidate()
+      return self.get_course(course_id)
     except (Forbidden, ResourceDoesNotExist, Unauthorized, TypeError):
       raise KeyError('Invalid Canvas course ID (canvas_course_id).')
 
@@ -85,7 +111,7 @@ class CourseManager:
 
     # Find course rubrics that follow the single-outcome-style naming
     # convention and have at least one criteria linked to an outcome.
-    rubrics = [r for r in course.get_rubrics()
+    rubrics = [r for r in self.get_rubric_registry(course).rubrics
       if r.title.startswith('Outcome Rubric:')
         and any(x.get('learning_outcome_id', None) for x in r.data)
     ]
@@ -107,6 +133,203 @@ class CourseManager:
     return response
 
 
+  def import_qti(self, course, file_path: str, settings: dict = None) -> ContentMigration:
+    if not isinstance(course, Course):
+      raise TypeError('Course argument must be of type canvasapi.Course.')
+
+    # Upload the package as a course file for Canvas to fetch. Its download
+    # URL carries a verifier, so the import needs no access token.
+    is_uploaded, attachment = course.upload(file_path)
+    if not is_uploaded:
+      raise IOError(f'Upload failed for QTI package {file_path}')
+    print('Uploaded QTI package.')
+
+    try:
+      migration = course.create_content_migration('qti_converter', settings={
+        **(settings or {}),
+        'file_url': attachment['url'],
+      })
+
+      progress = migration.get_progress()
+      print('Waiting for Canvas to import the package.', end='')
+      while progress.query().workflow_state not in ['completed', 'failed']:
+        print('.', end='')
+        # Wait one second between queries.
+        time.sleep(1)
+      print()
+    finally:
+      # The package is only needed until Canvas has imported it.
+      self.canvas.get_file(attachment['id']).delete()
+
+    if progress.workflow_state == 'failed':
+      raise IOError(f'Canvas could not import the QTI package: {getattr(progress, "message", None)}')
+
+    return migration
+
+
+  def map(self, func, items) -> list:
+    # Run independent requests concurrently, preserving result order. The
+    # session's rate limiter decides how many are actually in flight.
+    with ThreadPoolExecutor(max_workers=self.session.limiter.maximum) as executor:
+      return list(executor.map(func, items))
+
+
+  def paginate(self, course, kind: str, **options) -> Paginator:
+    if not isinstance(course, Course):
+      raise TypeError('Course argument must be of type canvasapi.Course.')
+
+    # Serve the listing from the course mirror while it is fresh enough.
+    mirror = self.get_mirror(course)
+    max_age = float(self.config.get('canvas_mirror_max_age', fallback='900'))
+    records = mirror.load(kind, max_age) if mirror else None
+
+    return Paginator(CourseMirror.KINDS[kind](course), records=records, **options)
+
+
+  def get_mirror(self, course, create = False) -> CourseMirror:
+    directory = self.config.get_data_path('mirror')
+
+    # Only courses that have been synced at least once have a mirror.
+    if not create and not path.isfile(CourseMirror.get_path(directory, course.id)):
+      return None
+
+    with self.locks['mirrors']:
+      if course.id not in self.mirrors:
+        self.mirrors[course.id] = CourseMirror(directory, course.id, self.get_outcome_history(course))
+      return self.mirrors[course.id]
+
+
+  def get_outcome_history(self, course) -> OutcomeHistory:
+    return OutcomeHistory(self.config.get_data_path('history'), course.id)
+
+
+  def get_outcome_results(self, course) -> pd.DataFrame:
+    # Read outcome results from the synced history while it is fresh enough.
+    history = self.get_outcome_history(course)
+    max_age = float(self.config.get('canvas_mirror_max_age', fallback='900'))
+    if history.exists() and (results := history.load(max_age)) is not None:
+      return results[OutcomeHistory.FIELDS]
+
+    results = self.paginate(course, 'outcome_results', project=OutcomeScore)
+    return pd.DataFrame([r.as_dict() for r in results], columns=OutcomeHistory.FIELDS)
+
+
+  def expire_mirror(self, course, kind: str) -> None:
+    if mirror := self.get_mirror(course):
+      mirror.expire(kind)
+
+
+  def get_roster(self, course) -> RosterIndex:
+    # One roster per course per session, kept on disk between sessions.
+    with self.locks['rosters']:
+      if course.id in self.rosters:
+        return self.rosters[course.id]
+
+      file_path = path.join(self.config.get_data_path('roster'), f'{course.id}.json')
+      roster = RosterIndex.load(file_path, int(self.config.get('canvas_roster_ttl', fallback='900')))
+
+      if not roster:
+        roster = RosterIndex(self.paginate(course, 'users', project=dict))
+        roster.save(file_path)
+
+      self.rosters[course.id] = roster
+      return roster
+
+
+  def get_outcome_links(self, course) -> list:
+    # Outcome links rarely change, so one listing serves a whole session.
+    with self.locks['outcome_links']:
+      if course.id not in self.outcome_links:
+        self.outcome_links[course.id] = list(self.paginate(course, 'outcome_links'))
+      return self.outcome_links[course.id]
+
+
+  def get_rubric_registry(self, course) -> RubricRegistry:
+    with self.locks['rubric_registries']:
+      if course.id not in self.rubric_registries:
+        self.rubric_registries[course.id] = RubricRegistry(self, course)
+      return self.rubric_registries[course.id]
+
+
+  def get_journal(self, course, name: str, resume = False) -> SessionJournal:
+    return SessionJournal(SessionJournal.get_path(self.config.get_data_path('journals'), course.id, name), resume)
+
+
+  def get_outcome(self, id):
+    return self.get_outcome_catalog().get(self.canvas._Canvas__requester, id)
+
+
+  def get_outcomes(self, ids) -> dict:
+    return self.get_outcome_catalog().hydrate(self.canvas._Canvas__requester, ids, self.map)
+
+
+  def get_outcome_catalog(self) -> OutcomeCatalog:
+    if not getattr(self, 'outcome_catalog', None):
+      self.outcome_catalog = OutcomeCatalog(
+        self.config.get_data_path(),
+        ttl=int(self.config.get('canvas_outcome_ttl', fallback='86400')),
+      )
+    return self.outcome_catalog
+
+
+  def get_question_map(self) -> QuestionMap:
+    return QuestionMap(self.config.get_data_path())
+
+
+  def get_score_cache(self) -> ScoreCache:
+    return ScoreCache(self.config.get_data_path('scores'))
+
+
+  def get_figure_registry(self, folder) -> FigureRegistry:
+    return FigureRegistry(self, self.config.get_data_path('figures'), folder)
+
+
+  def get_quiz_sync(self, quiz) -> QuizSync:
+    return QuizSync(self, self.config.get_data_path('quizzes'), quiz)
+
+
+  def get_response_cache(self) -> ResponseCache:
+    if self.config.get('canvas_http_cache', fallback='false').lower() != 'true':
+      return None
+    size = float(self.config.get('canvas_http_cache_size', fallback='100'))
+    return ResponseCache.shared(self.config.get_data_path(), max_size=int(size * 1024 * 1024))
+
+
+  def get_async_client(self) -> AsyncClient:
+    if not getattr(self, 'async_client', None):
+      self.async_client = AsyncClient(self)
+    return self.async_client
+
+
+  def _authenticate(self) -> None:
+    if self.config.get('canvas_keyring_disable').lower() == 'true':
+      return self._init_without_keyring()
+
+    keyring_name = self.config.get('canvas_keyring_name')
+    keyring_user = self.config.get('canvas_keyring_user')
+
+    token = keyring.get_password(keyring_name, keyring_user)
+
+    if token:
+      try:
+        self._connect(token)
+        return
+      except InvalidAccessToken:
+        print('Invalid Canvas access token.')
+        pass
+
+    # Fall back to config value if possible, or ask the user for input otherwise.
+    token = self.config.get('canvas_api_token') or getpass.getpass('Enter new Canvas access token:')
+
+    try:
+      self._connect(token)
+      keyring.set_password(keyring_name, keyring_user, token)
+      print('Access token saved.')
+      return
+    except InvalidAccessToken:
+      raise KeyError('Invalid Canvas access token. Try again.')
+
+
   def _init_without_keyring(self) -> None:
     token = self.config.get('canvas_api_token')
 
@@ -120,21 +343,43 @@ class CourseManager:
       raise KeyError('Invalid Canvas access token (canvas_api_token).')
 
 
-  def _connect(self, token) -> None:
-    canvas = Canvas(self.config.get('canvas_url').rstrip('/'), token)
-    canvas.get_current_user()
-    self._set_logging()
-    self.canvas = canvas
-    print('Connected to Canvas.')
+  def _connect_from_cache(self) -> bool:
+    if not (entry := self.session_cache.load(self.url)):
+      return False
+
+    self._connect(*entry)
+    return True
 
 
-  def _set_logging(self) -> None:
-    logger = logging.getLogger('canvasapi')
-    level = self.config.get('canvas_log_level')
-    handler = logging.FileHandler(path.join(self.config.get('canvas_log_dir'), 'canvas.log'))
-    formatter = logging.Formatter('%(asctime)s %(levelname)s [%(name)s] %(message)s')
+  def _revalidate(self) -> None:
+    print('Cached Canvas session expired.')
+    self.session_cache.invalidate(self.url)
+    self._authenticate()
 
-    handler.setLevel(level)
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-    logger.setLevel(level)
+
+  def _connect(self, token, user = None) -> None:
+    canvas = Canvas(self.url, token)
+
+    # Share one keep-alive session per URL and token across the process.
+    session = canvas._Canvas__requester._session = session_pool.get(
+      self.url,
+      token.strip(),
+      pool_size=int(self.config.get('canvas_pool_size', fallback='10')),
+      http2=self.config.get('canvas_http2', fallback='false').lower() == 'true',
+      max_in_flight=int(self.config.get('canvas_max_in_flight', fallback='8')),
+      retry_attempts=int(self.config.get('canvas_retry_attempts', fallback='5')),
+      cache=self.get_response_cache(),
+      decoder=self.config.get('canvas_json_decoder', fallback='auto'),
+    )
+
+    self.unverified = user is not None
+
+    if not user:
+      current = canvas.get_current_user()
+      user = {'id': current.id, 'name': getattr(current, 'name', None)}
+      self.session_cache.save(self.url, token, user)
+
+    self.canvas = canvas
+    self.session = session
+    self.user = user
+    print('Connected to Canvas.')
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from os import path
+from datetime import datetime, timezone
+from canvas.paginator import Paginator
+
+class CourseMirror:
+
+  # Collections kept in the mirror, and how each one is listed from Canvas.
+  KINDS = {
+    'assignments': lambda course: course.get_assignments(),
+    'quizzes': lambda course: course.get_quizzes(),
+    'users': lambda course: course.get_users(enrollment_type=['student']),
+    'outcome_links': lambda course: course.get_all_outcome_links_in_context(),
+    'rubrics': lambda course: course.get_rubrics(),
+    'outcome_results': lambda course: course.get_outcome_results(),
+  }
+
+  # Outcome results are re-fetched only for students graded since the last
+  # sync, asking Canvas for this many students per request.
+  USER_BATCH = 50
+
+  def __init__(self, directory: str, course_id, history = None) -> None:
+    self.db_path = self.get_path(directory, course_id)
+    self.history = history
+    self.lock = threading.Lock()
+
+    # Mirrored users include emails and SIS IDs, so the database is readable
+    # by the current user only. SQLite gives its WAL files the same mode.
+    os.close(os.open(self.db_path, os.O_WRONLY | os.O_CREAT, 0o600))
+    os.chmod(self.db_path, 0o600)
+
+    self.db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+    self.db.executescript('''
+      PRAGMA journal_mode = WAL;
+      CREATE TABLE IF NOT EXISTS records (
+        kind TEXT NOT NULL,
+        id TEXT NOT NULL,
+        user_id INTEGER,
+        updated_at TEXT,
+        data TEXT NOT NULL,
+        PRIMARY KEY (kind, id)
+      );
+      CREATE INDEX IF NOT EXISTS records_user ON records (kind, user_id);
+      CREATE TABLE IF NOT EXISTS syncs (
+        kind TEXT PRIMARY KEY,
+        synced_at REAL NOT NULL,
+        cursor TEXT
+      );
+    ''')
+
+
+  @staticmethod
+  def get_path(directory: str, course_id) -> str:
+    return path.join(directory, f'{course_id}.sqlite')
+
+
+  def load(self, kind: str, max_age: float) -> list:
+    # None means the mirror cannot answer, so callers ask Canvas instead.
+    if max_age <= 0 or (synced_at := self.synced_at(kind)) is None:
+      return None
+    if time.time() - synced_at > max_age:
+      return None
+
+    with self.lock:
+      rows = self.db.execute('SELECT data FROM records WHERE kind = ?', (kind,)).fetchall()
+    return [json.loads(row[0]) for row in rows]
+
+
+  def synced_at(self, kind: str) -> float:
+    with self.lock:
+      row = self.db.execute('SELECT synced_at FROM syncs WHERE kind = ?', (kind,)).fetchone()
+    return row[0] if row else None
+
+
+  def expire(self, kind: str) -> None:
+    # Changes made through the toolkit send readers back to Canvas until the
+    # next sync, rather than serving a listing known to be out of date.
+    with self.lock:
+      self.db.execute('UPDATE syncs SET synced_at = 0 WHERE kind = ?', (kind,))
+
+
+  def sync(self, course) -> dict:
+    changes = {}
+
+    for kind, listing in self.KINDS.items():
+      if kind == 'outcome_results':
+        changes[kind] = self.sync_outcome_results(course)
+      else:
+        changes[kind] = self.sync_kind(kind, list(Paginator(listing(course), project=dict)))
+
+    return changes
+
+
+  def sync_kind(self, kind: str, records: list) -> int:
+    started = time.time()
+
+    with self.lock:
+      existing = dict(self.db.execute('SELECT id, data FROM records WHERE kind = ?', (kind,)).fetchall())
+
+    # Only write what changed. Records with updated_at compare on it alone.
+    rows = []
+    for record in records:
+      id = str(record.get('id', record.get('outcome', {}).get('id', '')))
+      data = json.dumps(record, sort_keys=True)
+      previous = existing.pop(id, None)
+      if previous is not None:
+        updated_at = record.get('updated_at')
+        if previous == data or (updated_at and json.loads(previous).get('updated_at') == updated_at):
+          continue
+      rows.append((kind, id, record.get('updated_at'), data))
+
+    with self.lock:
+      self.db.execute('BEGIN')
+      self.db.executemany('INSERT OR REPLACE INTO records (kind, id, updated_at, data) VALUES (?, ?, ?, ?)', rows)
+      self.db.executemany('DELETE FROM records WHERE kind = ? AND id = ?', [(kind, id) for id in existing])
+      self.db.execute('INSERT OR REPLACE INTO syncs VALUES (?, ?, NULL)', (kind, started))
+      self.db.execute('COMMIT')
+
+    return len(rows) + len(existing)
+
+
+  def sync_outcome_results(self, course) -> int:
+    kind = 'outcome_results'
+    started = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+    with self.lock:
+      row = self.db.execute('SELECT cursor FROM syncs WHERE kind = ?', (kind,)).fetchone()
+    cursor = row[0] if row else None
+
+    # Mirrors synced before the history existed start it from scratch.
+    if self.history and not self.history.exists():
+      cursor = None
+
+    if not cursor:
+      # First sync: take every result in the course.
+      results = list(Paginator(self.KINDS[kind](course), project=dict))
+      return self.replace_outcome_results(None, results, started)
+
+    # Later syncs: only students with submissions graded since the cursor.
+    user_ids = sorted({s['user_id'] for s in Paginator(
+      course.get_multiple_submissions(student_ids=['all'], graded_since=cursor), project=dict,
+    ) if s.get('user_id')})
+
+    results = []
+    for i in range(0, len(user_ids), self.USER_BATCH):
+      batch = user_ids[i:i + self.USER_BATCH]
+      results += Paginator(course.get_outcome_results(user_ids=batch), project=dict)
+
+    return self.replace_outcome_results(user_ids, results, started)
+
+
+  def replace_outcome_results(self, user_ids: list, results: list, cursor: str) -> int:
+    kind = 'outcome_results'
+    rows = [(kind, str(r['id']), int(r['links']['user']), json.dumps(r)) for r in results]
+
+    with self.lock:
+      self.db.execute('BEGIN')
+      if user_ids is None:
+        self.db.execute('DELETE FROM records WHERE kind = ?', (kind,))
+      else:
+        self.db.executemany('DELETE FROM records WHERE kind = ? AND user_id = ?', [(kind, u) for u in user_ids])
+      self.db.executemany('INSERT OR REPLACE INTO records (kind, id, user_id, data) VALUES (?, ?, ?, ?)', rows)
+      self.db.execute('INSERT OR REPLACE INTO syncs VALUES (?, ?, ?)', (kind, time.time(), cursor))
+      self.db.execute('COMMIT')
+
+    # Keep every synced result for analytics, not just the latest ones.
+    if self.history:
+      self.history.append(results, user_ids)
+
+    return len(rows)
@@ -0,0 +1,78 @@
+import os
+import json
+import hashlib
+import threading
+
+from os import path
+from canvas.paginator import Paginator
+
+class FigureRegistry:
+
+  def __init__(self, course_manager, directory: str, folder) -> None:
+    self.course_manager = course_manager
+    self.folder = folder
+    self.map_path = path.join(directory, f'{folder.id}.json')
+    self.lock = threading.Lock()
+
+    self.figures = {}
+    if path.isfile(self.map_path):
+      with open(self.map_path) as file:
+        self.figures = json.load(file)
+
+    # Figures deleted from the folder in Canvas are uploaded again.
+    if self.figures:
+      existing = {str(f['id']) for f in Paginator(folder.get_files(), project=dict)}
+      self.figures = {hash: figure for hash, figure in self.figures.items() if str(figure['id']) in existing}
+
+
+  @staticmethod
+  def hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+      for block in iter(lambda: file.read(1 << 20), b''):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+  @staticmethod
+  def tag(figure: dict) -> str:
+    return f'<img id="{figure["id"]}" src="{figure["url"]}" alt="" />'
+
+
+  def upload(self, file_paths) -> dict:
+    # Identical figures share one upload, however many questions use them.
+    hashes = {file_path: self.hash(file_path) for file_path in dict.fromkeys(file_paths)}
+    pending = {hash: file_path for file_path, hash in hashes.items() if hash not in self.figures}
+
+    reused = len(set(hashes.values())) - len(pending)
+    if reused:
+      print(f'Reusing {reused} figures already in the folder.')
+
+    try:
+      self.course_manager.map(lambda item: self.upload_file(*item), pending.items())
+    finally:
+      self.save()
+
+    return {file_path: self.tag(self.figures[hash]) for file_path, hash in hashes.items()}
+
+
+  def upload_file(self, hash: str, file_path: str) -> None:
+    is_uploaded, response = self.folder.upload(file_path)
+    if not is_uploaded:
+      raise IOError(f'Upload failed for figure {file_path}')
+    print(f'Figure {response["filename"]} uploaded.')
+
+    with self.lock:
+      self.figures[hash] = {
+        'id': response['id'],
+        'url': response['preview_url'].split('?')[0].replace('file_', ''),
+        'filename': response['filename'],
+      }
+
+
+  def save(self) -> None:
+    with self.lock:
+      temp_path = f'{self.map_path}.tmp'
+      with open(temp_path, 'w') as file:
+        json.dump(self.figures, file)
+      os.replace(temp_path, self.map_path)
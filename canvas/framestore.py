@@ -0,0 +1,95 @@
+import os
+import glob
+import logging
+import pandas as pd
+
+from os import path
+
+logger = logging.getLogger(__name__)
+
+class FrameStore:
+
+  def __init__(self, directory: str) -> None:
+    self.directory = directory
+
+    try:
+      from pyarrow import feather
+      self.feather = feather
+    except ImportError:
+      self.feather = None
+
+
+  def read(self, name: str, index: str = None) -> pd.DataFrame:
+    feather_path = path.join(self.directory, f'{name}.feather')
+    pickle_path = path.join(self.directory, f'{name}.pickle')
+
+    try:
+      if self.feather and path.isfile(feather_path):
+        # Uncompressed Feather files are mapped rather than read.
+        df = self.feather.read_table(feather_path, memory_map=True).to_pandas()
+        return df.set_index(index) if index else df
+
+      if path.isfile(pickle_path):
+        return pd.read_pickle(pickle_path)
+    except Exception as e:
+      logger.warning(f'Discarding unreadable frame {name}: {e}')
+
+    return None
+
+
+  def write(self, name: str, df: pd.DataFrame, index: str = None) -> None:
+    if self.feather:
+      try:
+        # Feather keeps no index, so a named one is stored as a column.
+        self._write(f'{name}.feather', lambda temp_path: self.feather.write_feather(
+          df.reset_index() if index else df, temp_path, compression='uncompressed'))
+        return self._remove(f'{name}.pickle')
+      except Exception as e:
+        # Columns of mixed types cannot be stored as Arrow.
+        logger.info(f'Storing frame {name} as a pickle: {e}')
+
+    self._write(f'{name}.pickle', lambda temp_path: df.to_pickle(temp_path))
+    self._remove(f'{name}.feather')
+
+
+  def names(self) -> list:
+    entries = glob.glob(path.join(self.directory, '*.feather')) + glob.glob(path.join(self.directory, '*.pickle'))
+    return sorted({path.splitext(path.basename(entry))[0] for entry in entries})
+
+
+  def delete(self, name: str) -> None:
+    for extension in ['feather', 'pickle']:
+      self._remove(f'{name}.{extension}')
+
+
+  def exists(self, name: str) -> bool:
+    return any(path.isfile(path.join(self.directory, f'{name}.{extension}')) for extension in ['feather', 'pickle'])
+
+
+  def prune(self, keep: int) -> None:
+    # Keep only the most recently written frames.
+    entries = sorted(
+      glob.glob(path.join(self.directory, '*.feather')) + glob.glob(path.join(self.directory, '*.pickle')),
+      key=path.getmtime,
+      reverse=True,
+    )
+    for entry in entries[keep:]:
+      os.remove(entry)
+
+
+  def _write(self, name: str, write) -> None:
+    file_path = path.join(self.directory, name)
+    temp_path = f'{file_path}.tmp'
+
+    # Frames can hold student emails, so they are readable by the current
+    # user only. Writers reuse the file, and with it the mode, given here.
+    self._remove(f'{name}.tmp')
+    os.close(os.open(temp_path, os.O_WRONLY | os.O_CREAT, 0o600))
+    write(temp_path)
+    os.replace(temp_path, file_path)
+
+
+  def _remove(self, name: str) -> None:
+    file_path = path.join(self.directory, name)
+    if path.isfile(file_path):
+      os.remove(file_path)
@@ -1,10 +1,13 @@
 import time
+import asyncio
+import pandas as pd
 
 from canvas import CourseManager
 from canvasapi.progress import Progress
 from canvas.cli import confirm, menu, text
 from canvasapi.assignment import Assignment
 from canvas.configcourse import ConfigCourse
+from canvas.assignmentindex import AssignmentIndex
 
 class Grader(object):
   # Assignment properties
@@ -25,18 +28,23 @@ class Grader(object):
   }
 
 
-  def __init__(self, config: ConfigCourse) -> None:
+  def __init__(self, config: ConfigCourse, resume = False, prefetcher = None) -> None:
     self.config = config
 
     print("Starting...")
 
-    # Connect to Canvas course.
-    self.course_manager = CourseManager(self.config)
-    self.course = self.course_manager.get_course()
+    # Connect to Canvas course, unless the prefetcher already has.
+    self.course_manager = prefetcher.course_manager if prefetcher else CourseManager(self.config)
+    self.course = prefetcher.get('course') if prefetcher else self.course_manager.get_course()
+
+    # Record selections, fetched data and finished changes as they happen.
+    self.journal = self.course_manager.get_journal(self.course, type(self).__name__, resume)
 
     # Pre-load existing assignments.
-    self.invalidate_assignments()
-    self.get_assignments()
+    assignments = prefetcher.get('assignments') if prefetcher else None
+    if assignments is None:
+      assignments = self.course_manager.paginate(self.course, 'assignments')
+    self.assignments = AssignmentIndex(assignments)
 
     # Set state.
     self.receptacle_upload_progress = None
@@ -46,32 +54,48 @@ class Grader(object):
     print()
 
 
-  def get_assignments(self):
-    if not self.assignments:
-      self.assignments = sorted(self.course.get_assignments(), key=lambda a: getattr(a, 'name', None))
+  def get_assignments(self, category = None) -> list:
+    return self.assignments.list(category)
+
+
+  def get_assignment(self, id) -> Assignment:
+    return self.assignments.get(id) or self.course.get_assignment(id)
+
 
-    return self.assignments
+  def resume_assignment(self, type: str) -> Assignment:
+    if not (id := self.journal.get(type)):
+      return None
+
+    assignment = self.get_assignment(id)
+    print(f'\n{str(type).capitalize()} (resumed):', assignment)
+    return assignment
 
 
-  def invalidate_assignments(self):
-    self.assignments = []
+  def add_assignment(self, assignment: Assignment) -> None:
+    self.assignments.add(assignment)
+
+    # The course mirror no longer has every assignment.
+    self.course_manager.expire_mirror(self.course, 'assignments')
 
 
   def get_mastery(self, receptacle: Assignment) -> Assignment:
+    if mastery := self.resume_assignment('mastery'):
+      return mastery
+
     # Use same assignment for mastery?
     mastery_same = confirm('Use the same assignment for mastery? ')
     print()
 
     if mastery_same:
       # Use receptacle as mastery.
+      self.journal.record('mastery', receptacle.id)
       return receptacle
 
     name = getattr(receptacle, 'name', None)
 
     # Select or create mastery.
     return self.select_or_create(
-      [a for a in self.get_assignments()
-        if a.grading_type == 'points' and a.submission_types == ['none'] and not a.is_quiz_assignment],
+      self.get_assignments('mastery'),
       type='mastery',
       default=f'{name} Mastery' if name else '',
     )
@@ -81,6 +105,9 @@ class Grader(object):
     if type not in self.assignment_defaults:
       raise ValueError('Type must be defined in assignment_defaults.')
 
+    if assignment := self.resume_assignment(type):
+      return assignment
+
     select_choice = 'Select from list'
     choices = [select_choice, 'Create new']
     index = menu(
@@ -92,6 +119,7 @@ class Grader(object):
     if selection == select_choice:
       index = menu(f'\nSelect {type} assignment:', list(map(str, collection)))
       print(f'\n{str(type).capitalize()}:', collection[index])
+      self.journal.record(type, collection[index].id)
       return collection[index]
 
     # Create a new assignment.
@@ -114,15 +142,62 @@ class Grader(object):
       print('View new assignment here:', url)
     print()
 
-    self.invalidate_assignments()
+    self.add_assignment(assignment)
+    self.journal.record(type, assignment.id)
 
     return assignment
 
 
+  def get_steps(self, key: str) -> dict:
+    # Steps already finished for one revision, such as a created quiz.
+    return self.journal.get('steps', {}).get(key, {})
+
+
+  def record_steps(self, key: str, **steps) -> None:
+    progress = self.journal.get('steps', {})
+    progress[key] = {**progress.get(key, {}), **steps}
+    self.journal.record('steps', progress)
+
+
+  def add_questions(self, quiz, questions: list, resumed = False) -> None:
+    # Questions added before an interruption keep their positions.
+    existing = {q.position for q in quiz.get_questions()} if resumed else set()
+
+    # Add questions concurrently, keeping their configured order.
+    client = self.course_manager.get_async_client()
+    asyncio.run(client.gather(*[client.create_question(quiz, {**question, 'position': i})
+      for i, question in enumerate(questions, 1) if i not in existing]))
+
+
+  def read_scores(self, data_path: str, rename = None) -> pd.DataFrame:
+    roster = self.course_manager.get_roster(self.course)
+
+    def parse(data_path: str) -> pd.DataFrame:
+      # Read CSV data without assigning an index column.
+      df_data = pd.read_csv(data_path, header=0, index_col=False)
+
+      # Validate submissions.
+      if df_data.empty:
+        return None
+
+      # Drop missing records.
+      df_data.drop(df_data[df_data['Status'] == 'Missing'].index, inplace=True)
+
+      if rename:
+        df_data.rename(columns=rename, inplace=True)
+
+      # Map emails to Canvas user IDs and set the index to match.
+      return roster.join(df_data, on='Email')
+
+    # Parsed exports are reused until the file or the roster changes.
+    return self.course_manager.get_score_cache().get(
+      data_path, parse, roster.version, getattr(rename, '__qualname__', ''),
+    )
+
+
   def get_outcome(self, id):
     if id not in self.outcomes:
-      self.outcomes[id] = self.course_manager.canvas.get_outcome(id)
-      print(f'Retrieved outcome {id}.')
+      self.outcomes[id] = self.course_manager.get_outcome(id)
     return self.outcomes[id]
 
 
@@ -133,35 +208,48 @@ class Grader(object):
 
     print(f'Grades were processed for {len(grades)} students.')
 
-    # Push scores to Canvas.
-    print()
-    push_notice = 'This will publish the mastery assignment. ' if not mastery.published else ''
-    push_grades = confirm(f'Upload mastery scores to Canvas? {push_notice}')
-
-    if not push_grades:
-      print('Nothing left to do.')
-      return
+    # Scores uploaded before an interruption are not uploaded again.
+    if progress_id := self.journal.get('mastery_progress'):
+      progress = self.course_manager.canvas.get_progress(progress_id)
+      print('\nMastery scores were already uploaded.')
+    else:
+      # Push scores to Canvas.
+      print()
+      push_notice = 'This will publish the mastery assignment. ' if not mastery.published else ''
+      push_grades = confirm(f'Upload mastery scores to Canvas? {push_notice}')
+
+      if not push_grades:
+        print('Nothing left to do.')
+        self.journal.clear()
+        return
+
+      # Publish mastery assignment.
+      if not mastery.published:
+        mastery.edit(assignment={
+          'published': True,
+        })
+        self.add_assignment(mastery)
+        print('Published mastery.')
 
-    # Publish mastery assignment.
-    if not mastery.published:
-      mastery.edit(assignment={
-        'published': True,
-      })
-      print('Published mastery.')
+      print()
+      progress = mastery.submissions_bulk_update(grade_data=grades)
+      self.journal.record('mastery_progress', progress.id)
 
-    print()
-    progress = mastery.submissions_bulk_update(grade_data=grades)
+    if not self.receptacle_upload_progress and (progress_id := self.journal.get('receptacle_progress')):
+      self.receptacle_upload_progress = self.course_manager.canvas.get_progress(progress_id)
     pushed_receptacle = isinstance(self.receptacle_upload_progress, Progress)
 
     # Choose to post receptacle grades.
     post_receptacle_grades = (
       pushed_receptacle
-      and mastery is not receptacle
+      and mastery.id != receptacle.id
+      and not self.journal.get('receptacle_posted')
       and confirm('Post receptacle grades to all students? ')
     )
     if post_receptacle_grades:
       self.await_upload_progress(self.receptacle_upload_progress)
       self.course_manager.post_grades(receptacle.id, graded_only=True)
+      self.journal.record('receptacle_posted', True)
       print('Posted receptacle grades.')
       print()
 
@@ -172,6 +260,9 @@ class Grader(object):
       self.course_manager.post_grades(mastery.id, graded_only=True)
       print('Posted mastery grades.')
 
+    # Nothing is left to resume.
+    self.journal.clear()
+
     print('\nDone.')
 
 
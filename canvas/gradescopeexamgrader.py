@@ -28,6 +28,9 @@ class GradescopeExamGrader(canvas.grader.Grader):
 
     grades = {}
 
+    # Criteria are paired with questions by outcome, since titles can change.
+    questions = {str(m['outcome_id']): m['question'] for m in self.matches.values() if m['outcome_id']}
+
     # Calculate rubric scores.
     for user_id, submission in submissions.iterrows():
       score = {
@@ -36,7 +39,11 @@ class GradescopeExamGrader(canvas.grader.Grader):
       }
 
       for criterion in rubric:
-        question = next(m['question'] for m in self.matches.values() if m['outcome'] == criterion['description'])
+        question = questions.get(str(criterion.get('learning_outcome_id')))
+        if question is None:
+          print('No question matches criterion:', criterion.get('description'))
+          continue
+
         try:
           rating = next(r for r in criterion['ratings'] if r['points'] == submission.loc[question])
         except StopIteration:
@@ -56,13 +63,16 @@ class GradescopeExamGrader(canvas.grader.Grader):
   def get_receptacle(self) -> Assignment:
     # Select or create receptacle.
     return self.select_or_create(
-      [a for a in self.get_assignments()
-        if a.grading_type == 'points' and a.submission_types == ['none'] and not a.is_quiz_assignment],
+      self.get_assignments('receptacle'),
       type='receptacle',
     )
 
 
   def get_scores(self):
+    # Reuse scores read before an interruption.
+    if 'submissions' in self.journal:
+      return self.journal.get_frame('submissions')
+
     box = Tk()
 
     # Show only file window, not full GUI.
@@ -71,35 +81,28 @@ class GradescopeExamGrader(canvas.grader.Grader):
     data_path = path.abspath(askopenfilename(filetypes=[('CSV', '*.csv')]))
     box.destroy()
 
-    # Read CSV data without assigning an index column.
-    df_data = pd.read_csv(data_path, header=0, index_col=False)
+    df_mapped = self.read_scores(data_path)
 
     # Validate submissions.
-    if df_data.empty:
+    if df_mapped is None:
       print('That CSV file does not contain data. Please select another.')
+      self.journal.record('receptacle', None)
       return None
 
-    # Drop missing records.
-    df_data.drop(df_data[df_data['Status'] == 'Missing'].index, inplace=True)
-
-    # Retrieve users.
-    users = {user.email: user.id
-      for user in self.course.get_users(enrollment_type=['student'])
-      if getattr(user, 'email', None)}
-
-    df_users = pd.DataFrame.from_dict(users, orient='index', columns=['user_id'])
-
-    # Map emails to Canvas user IDs and set the index to match.
-    df_mapped = df_data.join(df_users, on='Email', how='inner').set_index('user_id')
-
     if df_mapped.index.has_duplicates:
       print('That CSV file contains duplicate student emails. Please correct and try again.')
+      self.journal.record('receptacle', None)
       return None
 
-    return df_mapped
+    return self.journal.record_frame('submissions', df_mapped)
 
 
   def push_grades(self, receptacle: Assignment, submissions) -> None:
+    if 'receptacle_progress' in self.journal:
+      print('Receptacle scores were already uploaded.')
+      print()
+      return
+
     push_notice = 'This will publish the receptacle assignment. ' if not receptacle.published else ''
     push_grades = confirm(f'Upload receptacle scores to Canvas? {push_notice}', default='n')
     if not push_grades:
@@ -110,12 +113,14 @@ class GradescopeExamGrader(canvas.grader.Grader):
       'points_possible': submissions['Max Points'].iloc[0],
       'published': True,
     })
+    self.add_assignment(receptacle)
     print('Published receptacle.')
 
     grades = submissions['Total Score'].rename('posted_grade').to_frame().to_dict('index')
 
     # Update assignment.
     self.receptacle_upload_progress = receptacle.submissions_bulk_update(grade_data=grades)
+    self.journal.record('receptacle_progress', self.receptacle_upload_progress.id)
 
     print('Scores are uploading to Canvas in the background.')
     print()
@@ -124,9 +129,17 @@ class GradescopeExamGrader(canvas.grader.Grader):
   def get_rubric(self, receptacle: Assignment, submissions):
     mastery = self.get_mastery(receptacle)
 
+    # A rubric applied before an interruption is not applied again.
+    if 'rubric' in self.journal:
+      self.matches = self.journal.get('matches')
+      return mastery, self.journal.get('rubric')
+
     # Always overwrite existing rubrics for Gradescope exams.
     rubric = self.apply_rubric(mastery, submissions)
 
+    self.journal.record('matches', self.matches)
+    self.journal.record('rubric', rubric)
+
     return mastery, rubric
 
 
@@ -140,56 +153,43 @@ class GradescopeExamGrader(canvas.grader.Grader):
       for column in submissions.columns.values.tolist()
         if (match := question_pattern.search(column))}
 
-    outcomes_unsorted = {match.group(1).strip(): outcome
-      for link in self.course.get_all_outcome_links_in_context()
-        if (outcome := getattr(link, 'outcome'))
-          and (match := token_pattern.search(outcome.get('title', '')))}
-
-    # Sort the outcomes using natural numeric ordering (i.e. 2 before 10).
-    convert = lambda text: int(text) if text.isdigit() else text.lower()
-    split_numbers = lambda o: tuple(convert(s) for s in re.split('([0-9]+)', o[1]['title']))
-    outcomes = dict(sorted(outcomes_unsorted.items(), key=split_numbers))
-
-    matches = {}
-
-    # Find a match for each question so none get missed.
-    for id, column in questions.items():
-      if id in outcomes:
-        print(f'Question "{column}" will map to outcome "{outcomes[id]["title"]}"')
-        matches[id] = {
-          'question': column,
-          'outcome': outcomes[id]['title'],
-        }
-        continue
+    # Reuse the matches made for this exam's questions in an earlier run.
+    question_map = self.course_manager.get_question_map()
+    key = question_map.key(self.course.id, list(questions.values()))
 
-      # Make dictionary numerically subscriptable, yielding [(key, value), ...].
-      choices = list(outcomes.items())
+    if matches := question_map.get(key):
+      self.outcomes.update(self.course_manager.get_outcomes(
+        match['outcome_id'] for match in matches.values() if match['outcome_id']))
 
-      index = menu(
-        f'\nQuestion "{column}" does not have a match. Select an outcome:',
-        [str(c[1]['title']) for c in choices],
-      )
+      # Show saved matches under current outcome titles, and let a wrong one
+      # be fixed rather than applied to every later exam.
+      for match in matches.values():
+        if match['outcome_id']:
+          match['outcome'] = self.get_outcome(match['outcome_id']).title
+        print(f'Question "{match["question"]}" will map to outcome "{match["outcome"]}" (saved)')
+      print()
 
-      key = choices[index][0]
-      print(f'\nQuestion "{column}" will map to outcome "{outcomes[key]["title"]}"')
+      if not confirm('Use these saved matches?', default='y'):
+        matches = None
 
-      matches[key] = {
-        'question': column,
-        'outcome': outcomes[key]['title'],
-      }
-
-    print()
+    if not matches:
+      matches = self.match_questions(questions)
 
+    question_map.set(key, matches)
     self.matches = matches
 
+    # Hydrate every newly matched outcome at once rather than one at a time.
+    self.outcomes.update(self.course_manager.get_outcomes(
+      id for match in matches.values() if (id := match['outcome_id']) and id not in self.outcomes))
+
     criteria = {}
     points = 0
 
-    for i, id in enumerate(matches.keys()):
-      if not outcomes[id].get('id'):
+    for i, match in enumerate(matches.values()):
+      if not match['outcome_id']:
         continue
 
-      outcome = self.get_outcome(outcomes[id]['id'])
+      outcome = self.get_outcome(match['outcome_id'])
       points += outcome.points_possible
       # The Canvas API requires the criteria object to be an indexed list.
       criteria[i] = {
@@ -202,8 +202,9 @@ class GradescopeExamGrader(canvas.grader.Grader):
         'ratings': {j: rating for j, rating in enumerate(outcome.ratings)},
       }
 
-    # Apply rubric, overwriting existing rubrics on the assignment.
-    rubric = self.course.create_rubric(rubric={
+    # Apply rubric, overwriting existing rubrics on the assignment. An
+    # identical rubric from an earlier run is reused rather than recreated.
+    rubric = self.course_manager.get_rubric_registry(self.course).apply(rubric={
       'title': f'{mastery.name} Rubric',
       'points_possible': points,
       'free_form_criterion_comments': False,
@@ -216,9 +217,61 @@ class GradescopeExamGrader(canvas.grader.Grader):
       'hide_points': False,
       'purpose': 'grading',
       'use_for_grading': False,
-    })
+    }, current_id=getattr(mastery, 'rubric_settings', {}).get('id'))
+
+    # Reused rubrics do not update the assignment's points themselves.
+    if getattr(mastery, 'points_possible', None) != points:
+      mastery.edit(assignment={'points_possible': points})
+      self.add_assignment(mastery)
 
-    rubric = rubric['rubric']
     print('Applied rubric:', getattr(rubric, 'title', None))
 
     return rubric.data
+
+
+  def match_questions(self, questions: dict) -> dict:
+    token_pattern = re.compile(r'\[(.*?)\]')
+
+    outcomes_unsorted = {match.group(1).strip(): outcome
+      for link in self.course_manager.get_outcome_links(self.course)
+        if (outcome := getattr(link, 'outcome'))
+          and (match := token_pattern.search(outcome.get('title', '')))}
+
+    # Sort the outcomes using natural numeric ordering (i.e. 2 before 10).
+    convert = lambda text: int(text) if text.isdigit() else text.lower()
+    split_numbers = lambda o: tuple(convert(s) for s in re.split('([0-9]+)', o[1]['title']))
+    outcomes = dict(sorted(outcomes_unsorted.items(), key=split_numbers))
+
+    matches = {}
+
+    # Find a match for each question so none get missed.
+    for id, column in questions.items():
+      if id in outcomes:
+        print(f'Question "{column}" will map to outcome "{outcomes[id]["title"]}"')
+        matches[id] = {
+          'question': column,
+          'outcome': outcomes[id]['title'],
+          'outcome_id': outcomes[id].get('id'),
+        }
+        continue
+
+      # Make dictionary numerically subscriptable, yielding [(key, value), ...].
+      choices = list(outcomes.items())
+
+      index = menu(
+        f'\nQuestion "{column}" does not have a match. Select an outcome:',
+        [str(c[1]['title']) for c in choices],
+      )
+
+      key = choices[index][0]
+      print(f'\nQuestion "{column}" will map to outcome "{outcomes[key]["title"]}"')
+
+      matches[key] = {
+        'question': column,
+        'outcome': outcomes[key]['title'],
+        'outcome_id': outcomes[key].get('id'),
+      }
+
+    print()
+
+    return matches
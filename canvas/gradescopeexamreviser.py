@@ -37,14 +37,10 @@ class GradescopeExamReviser(canvas.grader.Grader):
     print(f'Found {scores.columns.size} questions and {scores.index.size} students eligible for revisions.')
     print()
 
-    if not confirm('Make revisions? '):
-      print('Nothing left to do.')
-      exit()
+    exam = self.get_exam_name()
 
-    print()
-    exam = text(
-      'Enter name for exam. This will be used as the prefix for all revision quizzes: ', strip=True,
-    ).strip(':')
+    # Questions finished before an interruption are not offered again.
+    self.skip_finished_questions(scores)
 
     while not scores.empty:
       columns = scores.columns.values.tolist()
@@ -52,10 +48,37 @@ class GradescopeExamReviser(canvas.grader.Grader):
       print()
       self.process_question(exam, scores.pop(columns[index]))
 
+    self.journal.clear()
+
     print('\nDone.')
 
 
+  def get_exam_name(self, prompt = 'Enter name for exam. This will be used as the prefix for all revision quizzes: '):
+    if 'exam' in self.journal:
+      return self.journal.get('exam')
+
+    if not confirm('Make revisions? '):
+      print('Nothing left to do.')
+      exit()
+
+    print()
+    return self.journal.record('exam', text(prompt, strip=True).strip(':'))
+
+
+  def skip_finished_questions(self, scores) -> None:
+    finished = [c for c in scores.columns.values.tolist() if self.get_steps(str(c)).get('done')]
+    for column in finished:
+      scores.pop(column)
+
+    if finished:
+      print(f'Skipping {len(finished)} questions already revised.')
+
+
   def get_scores(self):
+    # Reuse scores read before an interruption.
+    if 'submissions' in self.journal:
+      return self.journal.get_frame('submissions')
+
     box = Tk()
 
     # Show only file window, not full GUI.
@@ -64,32 +87,18 @@ class GradescopeExamReviser(canvas.grader.Grader):
     data_path = path.abspath(askopenfilename(filetypes=[('CSV', '*.csv')]))
     box.destroy()
 
-    # Read CSV data without assigning an index column.
-    df_data = pd.read_csv(data_path, header=0, index_col=False)
+    df_mapped = self.read_scores(data_path)
 
     # Validate submissions.
-    if df_data.empty:
+    if df_mapped is None:
       print('That CSV file does not contain data. Please select another.')
       return None
 
-    # Drop missing records.
-    df_data.drop(df_data[df_data['Status'] == 'Missing'].index, inplace=True)
-
-    # Retrieve users.
-    users = {user.email: user.id
-      for user in self.course.get_users(enrollment_type=['student'])
-      if getattr(user, 'email', None)}
-
-    df_users = pd.DataFrame.from_dict(users, orient='index', columns=['user_id'])
-
-    # Map emails to Canvas user IDs and set the index to match.
-    df_mapped = df_data.join(df_users, on='Email', how='inner').set_index('user_id')
-
     if df_mapped.index.has_duplicates:
       print('That CSV file contains duplicate student emails. Please correct and try again.')
       return None
 
-    return df_mapped
+    return self.journal.record_frame('submissions', df_mapped)
 
 
   def get_applicable_scores(self, submissions):
@@ -106,9 +115,30 @@ class GradescopeExamReviser(canvas.grader.Grader):
       print('No students are eligible for revisions.')
       return
 
+    key = str(column.name)
+
     # Create a new revision quiz.
     revision = self.get_revision(exam, column.name)
 
+    if not self.get_steps(key).get('assigned'):
+      self.assign_revision(revision, students)
+      self.record_steps(key, assigned=True)
+
+    # Publish revision quiz.
+    publish = confirm('Publish revision quiz? ')
+
+    revision.edit(quiz={
+      'only_visible_to_overrides': True,
+      'published': publish,
+    })
+
+    if publish:
+      print(f'Published revision {revision.title}.')
+
+    self.record_steps(key, done=True)
+
+
+  def assign_revision(self, revision: Quiz, students: list) -> None:
     # Set revision due date.
     due_iso = None
 
@@ -145,20 +175,23 @@ class GradescopeExamReviser(canvas.grader.Grader):
     print(f'\nAssigned revision to {len(students)} students.')
     print()
 
-    # Publish revision quiz.
-    publish = confirm('Publish revision quiz? ')
-
-    revision.edit(quiz={
-      'only_visible_to_overrides': True,
-      'published': publish,
-    })
-
-    if publish:
-      print(f'Published revision {revision.title}.')
-
 
   def get_revision(self, exam: str, question_name: str) -> Quiz:
     name = self.parse_question_name(question_name)
+    steps = self.get_steps(str(question_name))
+
+    # Prepare questions.
+    questions = [self.parse_question_tokens(q, {'assignment': exam})
+      for q in self.config.get_revision_questions()]
+
+    # Finish a revision quiz created before an interruption.
+    if steps.get('quiz'):
+      revision = self.course.get_quiz(steps['quiz'])
+      print('Revision (resumed):', revision.title)
+      if not steps.get('questions'):
+        self.add_revision_questions(revision, questions, str(question_name), resumed=True)
+      print()
+      return revision
 
     title = text('\nEnter name for question: ', default=f'{exam} Revision: {name}' if name else '')
 
@@ -167,10 +200,6 @@ class GradescopeExamReviser(canvas.grader.Grader):
     index = menu('\nSelect assignment group for revision quiz:', list(map(str, groups)))
     print()
 
-    # Prepare questions.
-    questions = [self.parse_question_tokens(q, {'assignment': exam})
-      for q in self.config.get_revision_questions()]
-
     texts = f'\n{styles.tab}'.join([f'{i}. {q["question_text"]}' for i, q in enumerate(questions, 1)])
 
     # Confirm revision question text.
@@ -186,15 +215,9 @@ class GradescopeExamReviser(canvas.grader.Grader):
       'shuffle_answers': False,
       'title': title,
     })
+    self.record_steps(str(question_name), quiz=revision.id)
 
-    points = []
-
-    # Add questions.
-    for question in questions:
-      revision.create_question(question=question)
-      points.append(float(question.get('points_possible', 0)))
-
-    revision.edit(quiz={'points_possible': sum(points)})
+    self.add_revision_questions(revision, questions, str(question_name))
 
     id = f' ({revision.id})' if getattr(revision, 'id', None) else ''
     print(f'\nCreated revision quiz {title}{id} in group {groups[index]}.')
@@ -205,6 +228,15 @@ class GradescopeExamReviser(canvas.grader.Grader):
     return revision
 
 
+  def add_revision_questions(self, revision: Quiz, questions: list, key: str, resumed = False) -> None:
+    self.add_questions(revision, questions, resumed)
+
+    points = [float(question.get('points_possible', 0)) for question in questions]
+
+    revision.edit(quiz={'points_possible': sum(points)})
+    self.record_steps(key, questions=True)
+
+
   def parse_question_name(self, question: str) -> str:
     question_pattern = re.compile(r'^[0-9]+: (.*?) \([0-9.]+ pts\)$')
     name = match.group(1).strip() if (match := question_pattern.search(question)) else question
@@ -3,7 +3,7 @@ import pandas as pd
 
 from os import path
 from tkinter import Tk
-from canvas.cli import confirm, menu, text
+from canvas.cli import menu
 from tkinter.filedialog import askopenfilenames
 from canvas.gradescopeexamreviser import GradescopeExamReviser
 
@@ -29,14 +29,10 @@ class GradescopeMultiQuizReviser(GradescopeExamReviser):
     print(f'Found {scores.columns.size} questions and {scores.index.size} students eligible for revisions.')
     print()
 
-    if not confirm('Make revisions? '):
-      print('Nothing left to do.')
-      exit()
+    quiz = self.get_exam_name('Enter a name for the quiz. This will be used as the prefix for all revision quizzes: ')
 
-    print()
-    quiz = text(
-      'Enter a name for the quiz. This will be used as the prefix for all revision quizzes: ', strip=True,
-    ).strip(':')
+    # Questions finished before an interruption are not offered again.
+    self.skip_finished_questions(scores)
 
     while not scores.empty:
       columns = scores.columns.values.tolist()
@@ -44,10 +40,16 @@ class GradescopeMultiQuizReviser(GradescopeExamReviser):
       print()
       self.process_question(quiz, scores.pop(columns[index]))
 
+    self.journal.clear()
+
     print('\nDone.')
 
 
   def get_all_scores(self):
+    # Reuse scores read before an interruption.
+    if 'submissions' in self.journal:
+      return self.journal.get_frame('submissions')
+
     box = Tk()
 
     # Show only file window, not full GUI.
@@ -81,37 +83,21 @@ class GradescopeMultiQuizReviser(GradescopeExamReviser):
       data_paths = set()
       return None
 
-    return submissions
+    return self.journal.record_frame('submissions', submissions)
 
 
   def get_scores(self, data_paths: set) -> list:
     data = []
 
     for data_path in data_paths:
-      # Read CSV data without assigning an index column.
-      df_data = pd.read_csv(data_path, header=0, index_col=False)
+      # Normalize columns to allow merging.
+      df_mapped = self.read_scores(data_path, rename=self.normalize_column)
 
       # Validate submissions.
-      if df_data.empty:
+      if df_mapped is None:
         print(f'WARNING: No data found in {data_path}')
         continue
 
-      # Drop missing records.
-      df_data.drop(df_data[df_data['Status'] == 'Missing'].index, inplace=True)
-
-      # Normalize columns to allow merging.
-      df_data.rename(columns=self.normalize_column, inplace=True)
-
-      # Retrieve users.
-      users = {user.email: user.id
-        for user in self.course.get_users(enrollment_type=['student'])
-        if getattr(user, 'email', None)}
-
-      df_users = pd.DataFrame.from_dict(users, orient='index', columns=['user_id'])
-
-      # Map emails to Canvas user IDs and set the index to match.
-      df_mapped = df_data.join(df_users, on='Email', how='inner').set_index('user_id')
-
       if df_mapped.index.has_duplicates:
         print(f'WARNING: Duplicate student emails in {data_path}')
         continue
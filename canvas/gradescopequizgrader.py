@@ -1,5 +1,7 @@
 import canvas.grader
 
+from canvas.paginator import Paginator
+from canvas.projections import SubmissionScore
 from canvas.cli import confirm, menu
 from canvasapi.assignment import Assignment
 
@@ -44,10 +46,13 @@ class GradescopeQuizGrader(canvas.grader.Grader):
 
 
   def get_receptacle(self) -> Assignment:
+    # A receptacle already published and synced needs neither step again.
+    if self.journal.get('synced') and (receptacle := self.resume_assignment('receptacle')):
+      return receptacle
+
     # Select or create receptacle.
     receptacle = self.select_or_create(
-      [a for a in self.get_assignments()
-        if a.grading_type == 'points' and a.submission_types == ['none'] and not a.is_quiz_assignment],
+      self.get_assignments('receptacle'),
       'receptacle',
     )
 
@@ -60,31 +65,45 @@ class GradescopeQuizGrader(canvas.grader.Grader):
       receptacle.edit(assignment={
         'published': True,
       })
+      self.add_assignment(receptacle)
       print('Published receptacle.')
 
     input('\nPlease go to Gradescope and click "Post Grades" to sync scores to Canvas. Press <Enter> when syncing complete.')
     print()
 
+    self.journal.record('synced', True)
+
     return receptacle
 
 
   def get_scores(self, receptacle: Assignment):
-    submissions = [s for s in receptacle.get_submissions()
-      if getattr(s, 'score', None) is not None and s.graded_at]
+    # Reuse submissions fetched before an interruption.
+    if 'submissions' in self.journal:
+      return [SubmissionScore(s) for s in self.journal.get('submissions')]
+
+    submissions = list(Paginator(receptacle.get_submissions(), project=SubmissionScore,
+      where=lambda s: s.score is not None and s.graded_at))
 
     # Validate submissions.
     if not submissions:
       print('That assignment has no submissions! Please select another.')
+      self.journal.record('receptacle', None)
+      self.journal.record('synced', False)
       return
 
     print(f'Found {len(submissions)} submissions.')
 
+    self.journal.record('submissions', [s.as_dict() for s in submissions])
+
     return submissions
 
 
   def get_rubric(self, receptacle: Assignment):
     mastery = self.get_mastery(receptacle)
 
+    if 'rubric' in self.journal:
+      return mastery, self.journal.get('rubric')
+
     settings = getattr(mastery, 'rubric_settings', {})
     rubric = getattr(mastery, 'rubric', None)
 
@@ -97,7 +116,7 @@ class GradescopeQuizGrader(canvas.grader.Grader):
     if not rubric or replace_rubric:
       rubric = self.apply_rubric(mastery)
 
-    return mastery, rubric[0]
+    return mastery, self.journal.record('rubric', rubric[0])
 
 
   def apply_rubric(self, mastery: Assignment):
@@ -1,6 +1,8 @@
 import canvas.grader
 
 from canvas import styles
+from canvas.paginator import Paginator
+from canvas.projections import SubmissionScore
 from string import Template
 from dateutil.tz import gettz
 from canvasapi.quiz import Quiz
@@ -32,13 +34,34 @@ class GradescopeQuizReviser(canvas.grader.Grader):
     print(f'Found {len(students)} students eligible for revisions.')
     print()
 
-    if not confirm('Make a revision? '):
+    if not self.get_steps('revision') and not confirm('Make a revision? '):
       print('Nothing left to do.')
       exit()
 
     # Create a new revision quiz.
     revision = self.get_revision(receptacle)
 
+    if not self.get_steps('revision').get('assigned'):
+      self.assign_revision(revision, students)
+      self.record_steps('revision', assigned=True)
+
+    # Publish revision quiz.
+    publish = confirm('Publish revision quiz? ')
+
+    revision.edit(quiz={
+      'only_visible_to_overrides': True,
+      'published': publish,
+    })
+
+    if publish:
+      print('Published revision.')
+
+    self.journal.clear()
+
+    print('\nDone.')
+
+
+  def assign_revision(self, revision: Quiz, students: list) -> None:
     due_iso = None
 
     # Set revision due date.
@@ -70,40 +93,37 @@ class GradescopeQuizReviser(canvas.grader.Grader):
     print(f'\nAssigned revision to {len(students)} students.')
     print()
 
-    # Publish revision quiz.
-    publish = confirm('Publish revision quiz? ')
-
-    revision.edit(quiz={
-      'only_visible_to_overrides': True,
-      'published': publish,
-    })
-
-    if publish:
-      print('Published revision.')
-
-    print('\nDone.')
-
 
   def get_receptacle(self) -> Assignment:
-    collection = [a for a in self.get_assignments()
-      if a.grading_type == 'points' and a.submission_types == ['none'] and not a.is_quiz_assignment]
+    if receptacle := self.resume_assignment('receptacle'):
+      return receptacle
+
+    collection = self.get_assignments('receptacle')
 
     index = menu('\nSelect receptacle assignment:', list(map(str, collection)))
     print('\nReceptacle:', collection[index])
+    self.journal.record('receptacle', collection[index].id)
     return collection[index]
 
 
   def get_scores(self, receptacle: Assignment):
-    submissions = [s for s in receptacle.get_submissions()
-      if getattr(s, 'score', None) is not None and s.graded_at]
+    # Reuse submissions fetched before an interruption.
+    if 'submissions' in self.journal:
+      return [SubmissionScore(s) for s in self.journal.get('submissions')]
+
+    submissions = list(Paginator(receptacle.get_submissions(), project=SubmissionScore,
+      where=lambda s: s.score is not None and s.graded_at))
 
     # Validate submissions.
     if not submissions:
       print('That quiz has no submissions! Please select another.')
+      self.journal.record('receptacle', None)
       return
 
     print(f'Found {len(submissions)} submissions.')
 
+    self.journal.record('submissions', [s.as_dict() for s in submissions])
+
     return submissions
 
 
@@ -114,6 +134,20 @@ class GradescopeQuizReviser(canvas.grader.Grader):
   def get_revision(self, receptacle: Assignment) -> Quiz:
     name = getattr(receptacle, 'name', None)
     url = getattr(receptacle, 'html_url', None)
+    steps = self.get_steps('revision')
+
+    # Prepare questions.
+    questions = [self.parse_question_tokens(q, {'assignment': name})
+      for q in self.config.get_revision_questions()]
+
+    # Finish a revision quiz created before an interruption.
+    if steps.get('quiz'):
+      revision = self.course.get_quiz(steps['quiz'])
+      print('Revision (resumed):', revision.title)
+      if not steps.get('questions'):
+        self.add_revision_questions(revision, questions, resumed=True)
+      print()
+      return revision
 
     title = text('\nEnter name for revision quiz: ', default=f'{name} Revision' if name else '')
 
@@ -122,10 +156,6 @@ class GradescopeQuizReviser(canvas.grader.Grader):
     index = menu('\nSelect assignment group for revision quiz:', list(map(str, groups)))
     print()
 
-    # Prepare questions.
-    questions = [self.parse_question_tokens(q, {'assignment': name})
-      for q in self.config.get_revision_questions()]
-
     texts = f'\n{styles.tab}'.join([f'{i}. {q["question_text"]}' for i, q in enumerate(questions, 1)])
 
     # Confirm revision question text.
@@ -141,15 +171,9 @@ class GradescopeQuizReviser(canvas.grader.Grader):
       'shuffle_answers': False,
       'title': title,
     })
+    self.record_steps('revision', quiz=revision.id)
 
-    points = []
-
-    # Add questions.
-    for question in questions:
-      revision.create_question(question=question)
-      points.append(float(question.get('points_possible', 0)))
-
-    revision.edit(quiz={'points_possible': sum(points)})
+    self.add_revision_questions(revision, questions)
 
     id = f' ({revision.id})' if getattr(revision, 'id', None) else ''
     print(f'\nCreated revision quiz {title}{id} in group {groups[index]}.')
@@ -160,6 +184,15 @@ class GradescopeQuizReviser(canvas.grader.Grader):
     return revision
 
 
+  def add_revision_questions(self, revision: Quiz, questions: list, resumed = False) -> None:
+    self.add_questions(revision, questions, resumed)
+
+    points = [float(question.get('points_possible', 0)) for question in questions]
+
+    revision.edit(quiz={'points_possible': sum(points)})
+    self.record_steps('revision', questions=True)
+
+
   def parse_question_tokens(self, question: dict, tokens: dict) -> dict:
     return {key: Template(value).safe_substitute(**tokens)
       for key, value in question.items()}
@@ -1,4 +1,5 @@
 import re
+import time
 import pandas as pd
 
 from os import path
@@ -6,7 +7,9 @@ from tkinter import Tk
 from typing import Self
 from canvas.cli import menu
 from canvas import CourseManager
+from canvas.prefetcher import Prefetcher
 from canvas.configcourse import ConfigCourse
+from canvas.sessionjournal import SessionJournal
 from tkinter.filedialog import asksaveasfilename
 from canvas.canvasquizscheduler import CanvasQuizScheduler
 
@@ -24,24 +27,48 @@ class GradingManager(object):
     return self
 
 
-  def start_grading(self) -> None:
-    index = menu('\nWhat kind of ungraded assignment?', [
+  def start_grading(self, resume = False) -> None:
+    prefetcher = self.prefetch()
+
+    grader = self.choose_workflow('\nWhat kind of ungraded assignment?', dict(zip([
       'Canvas Quiz', 'Gradescope Quiz', 'Gradescope Exam',
-    ])
-    print()
+    ], graders)), resume)
+
+    grader(self.config, resume=resume, prefetcher=prefetcher).do()
 
-    grader = graders[index](self.config)
-    grader.do()
 
+  def start_revisions(self, resume = False) -> None:
+    prefetcher = self.prefetch()
 
-  def start_revisions(self) -> None:
-    index = menu('\nWhat kind of revision assignment?', [
+    reviser = self.choose_workflow('\nWhat kind of revision assignment?', dict(zip([
       'Canvas Quiz', 'Gradescope Quiz', 'Gradescope Quiz (Multiple)', 'Gradescope Exam',
-    ])
+    ], revisers)), resume)
+
+    reviser(self.config, resume=resume, prefetcher=prefetcher).do()
+
+
+  def prefetch(self) -> Prefetcher:
+    # Load course data while the user answers the workflow prompts.
+    if self.config.manager.get('canvas_prefetch', fallback='true').lower() != 'true':
+      return None
+    return Prefetcher(self.config)
+
+
+  def choose_workflow(self, prompt: str, choices: dict, resume = False):
+    # Resuming only offers the kinds of workflow with an unfinished session.
+    if resume:
+      directory = self.config.manager.get_data_path('journals')
+      course_id = self.config.get('canvas_course_id')
+      pending = {label: workflow for label, workflow in choices.items()
+        if path.isfile(SessionJournal.get_path(directory, course_id, workflow.__name__))}
+      if len(pending) == 1:
+        return next(iter(pending.values()))
+      choices = pending or choices
+
+    index = menu(prompt, list(choices))
     print()
 
-    reviser = revisers[index](self.config)
-    reviser.do()
+    return list(choices.values())[index]
 
 
   def start_accommodations(self) -> None:
@@ -49,8 +76,8 @@ class GradingManager(object):
     scheduler.do_accommodations()
 
 
-  def start_opportunities(self) -> None:
-    scheduler = CanvasQuizScheduler(self.config)
+  def start_opportunities(self, resume = False) -> None:
+    scheduler = CanvasQuizScheduler(self.config, resume=resume, prefetcher=self.prefetch())
     scheduler.do_checkpoints()
 
 
@@ -62,68 +89,91 @@ class GradingManager(object):
     return course
 
 
-  def generate_single_outcome_rubrics(self) -> None:
+  def sync_course(self) -> None:
     course = self.get_course()
 
-    rubrics = []
-
-    for link in course.get_all_outcome_links_in_context():
-      if not hasattr(link, 'outcome'): continue
-
-      outcome = self.get_outcome(link.outcome['id'])
-      rubrics.append(course.create_rubric(rubric={
-        'title': f'Outcome Rubric: {getattr(outcome, "display_name", None)}',
-        'points_possible': outcome.mastery_points,
-        'free_form_criterion_comments': False,
-        'criteria': {
-          0: {
-            'learning_outcome_id': outcome.id,
-            'description': outcome.title,
-            'criterion_use_range': False,
-            'mastery_points': outcome.mastery_points,
-            'points': outcome.points_possible,
-            'ratings': {i: rating for i, rating in enumerate(outcome.ratings)},
-          },
-        },
-      }, rubric_association={
-        'association_id': course.id,
-        'association_type': 'Course',
-        'hide_outcome_results': False,
-        'hide_points': False,
-        'purpose': 'bookmark',
-        'use_for_grading': False,
-      }))
-
-    print('\nCreated', len(rubrics), 'rubrics.')
+    changes = self.course_manager.get_mirror(course, create=True).sync(course)
 
+    for kind, count in changes.items():
+      print(f'Synced {kind.replace("_", " ")}: {count} changed.')
 
-  def export_learning_mastery_gradebook(self):
-    print()
+
+  def generate_single_outcome_rubrics(self) -> None:
     course = self.get_course()
 
+    links = [link for link in self.course_manager.paginate(course, 'outcome_links') if hasattr(link, 'outcome')]
+
+    # Outcome and rubric requests are independent of one another.
+    self.outcomes.update(self.course_manager.get_outcomes(link.outcome['id'] for link in links))
+    outcomes = [self.get_outcome(link.outcome['id']) for link in links]
+    registry = self.course_manager.get_rubric_registry(course)
+    existing = sum(1 for outcome in outcomes if registry.find(self.get_outcome_criteria(outcome)))
+    rubrics = self.course_manager.map(lambda outcome: self.create_outcome_rubric(course, outcome), outcomes)
+
+    print('\nCreated', len(rubrics) - existing, 'rubrics.')
+    if existing:
+      print(f'Skipped {existing} rubrics that already exist.')
+
+
+  def create_outcome_rubric(self, course, outcome):
+    # Only outcomes without an identical rubric get a new one.
+    return self.course_manager.get_rubric_registry(course).apply(rubric={
+      'title': f'Outcome Rubric: {getattr(outcome, "display_name", None)}',
+      'points_possible': outcome.mastery_points,
+      'free_form_criterion_comments': False,
+      'criteria': self.get_outcome_criteria(outcome),
+    }, rubric_association={
+      'association_id': course.id,
+      'association_type': 'Course',
+      'hide_outcome_results': False,
+      'hide_points': False,
+      'purpose': 'bookmark',
+      'use_for_grading': False,
+    })
+
+
+  def get_outcome_criteria(self, outcome) -> dict:
+    return {
+      0: {
+        'learning_outcome_id': outcome.id,
+        'description': outcome.title,
+        'criterion_use_range': False,
+        'mastery_points': outcome.mastery_points,
+        'points': outcome.points_possible,
+        'ratings': {i: rating for i, rating in enumerate(outcome.ratings)},
+      },
+    }
+
+
+  def get_outcome_columns(self, course) -> dict:
     # Get all course outcomes and shorten their names if possible.
     outcome_pattern = re.compile(r'\[(.*?)\]')
     outcome_column = lambda t: f'{parts[0]}[{parts[1]}]' if (parts := outcome_pattern.split(t, maxsplit=1)) else t
     outcomes = {outcome['id']: outcome_column(outcome.get('title', ''))
-      for link in course.get_all_outcome_links_in_context()
+      for link in self.course_manager.paginate(course, 'outcome_links')
         if (outcome := getattr(link, 'outcome'))}
 
     print(f'Retrieved {len(outcomes)} outcomes.')
 
+    return outcomes
+
+
+  def export_learning_mastery_gradebook(self):
+    print()
+    course = self.get_course()
+
+    outcomes = self.get_outcome_columns(course)
+
     # Find all point-based assignments, including quizzes, since some may
     # have had mastery rubrics applied as part of the grading process.
-    assignments = {a.id: a.name for a in course.get_assignments() if a.grading_type == 'points'}
+    assignments = {a.id: a.name for a in self.course_manager.paginate(course, 'assignments') if a.grading_type == 'points'}
 
     print(f'Retrieved {len(assignments)} assignments.')
 
-    data = [(
-      outcomes.get(int(o.links['learning_outcome']), o.links['learning_outcome']),
-      assignments.get(int(o.links['alignment'].replace('assignment_', '')), o.links['alignment']),
-      int(o.links['user']),
-      o.score,
-    ) for o in course.get_outcome_results()]
+    started = time.time()
+    results = self.course_manager.get_outcome_results(course)
 
-    print(f'Retrieved {len(data)} results.')
+    print(f'Retrieved {len(results)} results in {time.time() - started:.2f} seconds.')
 
     # An opportunity is any instance of a rubric criterion that is linked to a
     # learning outcome. Since there will be multiple assignments and questions
@@ -134,7 +184,12 @@ class GradingManager(object):
     columns = ['outcome', 'assignment', 'student', 'score']
 
     # Construct a dataframe and add columns for opportunity counts.
-    df_flat = pd.DataFrame(data, columns=columns)
+    df_flat = pd.DataFrame({
+      'outcome': results['outcome_id'].map(lambda id: outcomes.get(int(id), id)),
+      'assignment': results['alignment'].map(lambda a: assignments.get(int(a.replace('assignment_', '')), a)),
+      'student': results['user_id'],
+      'score': results['score'],
+    }, columns=columns)
     df_pivot = df_flat.pivot(columns=['outcome', 'assignment'], index='student', values='score')
     opportunity_counts = df_pivot.T.groupby(level=0, sort=False).count().T
     df_pivot.columns = df_pivot.columns.map(': '.join)
@@ -152,13 +207,13 @@ class GradingManager(object):
 
     print('Sorted columns.')
 
-    students = {s.id: {
-      'Student': s.sortable_name, # student.name
-      'ID': s.id,
-      'SIS User ID': s.sis_user_id,
-      'SIS Login ID': s.login_id,
+    students = {s['id']: {
+      'Student': s['sortable_name'], # student.name
+      'ID': s['id'],
+      'SIS User ID': s['sis_user_id'],
+      'SIS Login ID': s['login_id'],
       # Section as well?
-    } for s in course.get_users(enrollment_type=['student']) if getattr(s, 'email', None)}
+    } for s in self.course_manager.get_roster(course).students if s['email']}
 
     # Map student details onto the sorted dataframe.
     df_students = pd.DataFrame.from_dict(students, orient='index')
@@ -179,8 +234,37 @@ class GradingManager(object):
     print('Saved gradebook to:', save_path)
 
 
+  def export_outcome_trends(self, period: str = 'month'):
+    print()
+    course = self.get_course()
+
+    history = self.course_manager.get_outcome_history(course)
+    if not history.exists():
+      print('No outcome history yet. Run `canvas sync` for this course first.')
+      return
+
+    outcomes = self.get_outcome_columns(course)
+
+    # Mean outcome scores by period, read entirely from the local history.
+    df_trends = history.trends({'month': 'M', 'quarter': 'Q', 'year': 'Y'}[period])
+    df_trends.index = df_trends.index.map(lambda id: outcomes.get(int(id), id))
+    df_trends.index.name = 'Outcome'
+
+    print(f'Computed trends for {len(df_trends)} outcomes over {len(df_trends.columns)} {period}s.')
+
+    box = Tk()
+    # Show only file window, not full GUI.
+    box.withdraw()
+    box.attributes('-topmost', True)
+    save_path = path.abspath(asksaveasfilename(initialfile='trends', defaultextension='.csv'))
+    box.destroy()
+
+    df_trends.to_csv(save_path, encoding='utf-8')
+
+    print('Saved trends to:', save_path)
+
+
   def get_outcome(self, id):
     if id not in self.outcomes:
-      self.outcomes[id] = self.course_manager.canvas.get_outcome(id)
-      print(f'Retrieved outcome {id}.')
+      self.outcomes[id] = self.course_manager.get_outcome(id)
     return self.outcomes[id]
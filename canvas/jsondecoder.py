@@ -0,0 +1,27 @@
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class JsonDecoder:
+
+  def __init__(self, name: str = 'auto') -> None:
+    self.name = 'json'
+    self.loads = json.loads
+
+    if name not in ['auto', 'orjson']:
+      return
+
+    try:
+      import orjson
+      self.name = 'orjson'
+      self.loads = orjson.loads
+    except ImportError:
+      if name == 'orjson':
+        logger.warning('JSON decoder orjson requested but unavailable. Using json instead.')
+
+
+  def bind(self, response) -> None:
+    # canvasapi decodes through response.json(), so replace it per response.
+    loads = self.loads
+    response.json = lambda **kwargs: loads(response.content)
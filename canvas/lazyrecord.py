@@ -0,0 +1,44 @@
+import arrow
+import pytz
+
+class LazyRecord:
+
+  # Built classes, one per canvasapi content class.
+  classes = {}
+
+  def __init__(self, requester, attributes: dict) -> None:
+    # Skip CanvasObject.set_attributes, which tries to parse every value
+    # as a date, and keep the decoded JSON until attributes are read.
+    self._requester = requester
+    self._attributes = attributes
+
+
+  def __getattr__(self, name: str):
+    # Only reached when normal lookup fails, so each value is built once.
+    attributes = self.__dict__.get('_attributes', {})
+
+    if name in attributes:
+      value = attributes[name]
+    elif name.endswith('_date') and (raw := attributes.get(name[:-5])):
+      value = self._parse_date(raw)
+    else:
+      raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    self.__dict__[name] = value
+    return value
+
+
+  def _parse_date(self, value):
+    # Matches canvasapi's conversion of ISO 8601 strings to aware datetimes.
+    try:
+      naive = arrow.get(str(value)).datetime
+      return naive.replace(tzinfo=pytz.utc) - naive.utcoffset()
+    except (arrow.ParserError, ValueError):
+      raise AttributeError('Not a date value.')
+
+
+def lazy_class(content_class):
+  if content_class not in LazyRecord.classes:
+    name = f'Lazy{content_class.__name__}'
+    LazyRecord.classes[content_class] = type(name, (LazyRecord, content_class), {})
+  return LazyRecord.classes[content_class]
@@ -0,0 +1,61 @@
+import json
+import queue
+import atexit
+import logging
+
+from os import path
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# The single listener for the process, which writes logs off the request path.
+listener = None
+
+class JsonFormatter(logging.Formatter):
+
+  def format(self, record: logging.LogRecord) -> str:
+    entry = {
+      'time': self.formatTime(record),
+      'level': record.levelname,
+      'logger': record.name,
+      'thread': record.threadName,
+      'message': record.getMessage(),
+    }
+    if record.exc_info:
+      entry['exception'] = self.formatException(record.exc_info)
+    return json.dumps(entry)
+
+
+def configure(config) -> None:
+  global listener
+
+  if listener:
+    return
+
+  level = config.get('canvas_log_level')
+  max_size = float(config.get('canvas_log_max_size', fallback='10'))
+  backups = int(config.get('canvas_log_backups', fallback='3'))
+
+  handler = RotatingFileHandler(
+    path.join(config.get('canvas_log_dir'), 'canvas.log'),
+    maxBytes=int(max_size * 1024 * 1024),
+    backupCount=backups,
+    encoding='utf-8',
+    delay=True,
+  )
+  handler.setLevel(level)
+
+  if config.get('canvas_log_format', fallback='text').lower() == 'json':
+    handler.setFormatter(JsonFormatter())
+  else:
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(name)s] %(message)s'))
+
+  # Loggers only enqueue records. The listener thread does the disk I/O.
+  records = queue.SimpleQueue()
+  listener = QueueListener(records, handler, respect_handler_level=True)
+  listener.start()
+  atexit.register(listener.stop)
+
+  # Log both the Canvas API library and the toolkit's own modules.
+  for name in ['canvasapi', 'canvas']:
+    logger = logging.getLogger(name)
+    logger.addHandler(QueueHandler(records))
+    logger.setLevel(level)
@@ -0,0 +1,74 @@
+import json
+import time
+import sqlite3
+import threading
+
+from os import path
+from canvasapi.outcome import Outcome
+
+class OutcomeCatalog:
+
+  # Constants
+  CACHE_FILE = 'outcomes.sqlite'
+
+  def __init__(self, directory: str, ttl: int = 86400) -> None:
+    self.cache_path = path.join(directory, self.CACHE_FILE)
+    self.ttl = ttl
+    self.lock = threading.Lock()
+
+    # Outcomes are keyed by Canvas instance and ID only, so account-level
+    # outcomes shared between courses are fetched once for all of them.
+    self.db = sqlite3.connect(self.cache_path, check_same_thread=False, isolation_level=None)
+    self.db.executescript('''
+      PRAGMA journal_mode = WAL;
+      CREATE TABLE IF NOT EXISTS outcomes (
+        url TEXT NOT NULL,
+        id INTEGER NOT NULL,
+        data TEXT NOT NULL,
+        etag TEXT,
+        fetched_at REAL NOT NULL,
+        PRIMARY KEY (url, id)
+      );
+    ''')
+
+
+  def get(self, requester, id) -> Outcome:
+    entry = self.load(requester.base_url, id)
+
+    if not entry or time.time() - entry['fetched_at'] > self.ttl:
+      entry = self.fetch(requester, id, entry)
+
+    return Outcome(requester, json.loads(entry['data']))
+
+
+  def hydrate(self, requester, ids, map) -> dict:
+    # Fetch every missing or stale outcome concurrently, in a single pass.
+    ids = list(dict.fromkeys(int(id) for id in ids))
+    return dict(zip(ids, map(lambda id: self.get(requester, id), ids)))
+
+
+  def load(self, url: str, id) -> dict:
+    with self.lock:
+      row = self.db.execute(
+        'SELECT data, etag, fetched_at FROM outcomes WHERE url = ? AND id = ?', (url, int(id)),
+      ).fetchone()
+    return {'data': row[0], 'etag': row[1], 'fetched_at': row[2]} if row else None
+
+
+  def fetch(self, requester, id, entry: dict = None) -> dict:
+    # Stale entries are revalidated rather than downloaded again.
+    headers = {'If-None-Match': entry['etag']} if entry and entry['etag'] else {}
+    response = requester.request('GET', f'outcomes/{id}', headers=headers)
+
+    if response.status_code == 304 and entry:
+      entry = {**entry, 'fetched_at': time.time()}
+    else:
+      entry = {'data': response.text, 'etag': response.headers.get('ETag'), 'fetched_at': time.time()}
+      print(f'Retrieved outcome {id}.')
+
+    with self.lock:
+      self.db.execute('INSERT OR REPLACE INTO outcomes VALUES (?, ?, ?, ?, ?)', (
+        requester.base_url, int(id), entry['data'], entry['etag'], entry['fetched_at'],
+      ))
+
+    return entry
@@ -0,0 +1,136 @@
+import os
+import time
+import pandas as pd
+
+from os import path
+from canvas.framestore import FrameStore
+
+class OutcomeHistory:
+
+  # Columns kept for each outcome result, as read by exports and checkpoints.
+  FIELDS = ['outcome_id', 'alignment', 'user_id', 'score']
+  COLUMNS = ['id', *FIELDS, 'assessed_at', 'synced_at', 'removed']
+
+  # A result is stored again only when one of these changes.
+  KEY = ['id', 'user_id']
+  VERSION = [*KEY, 'outcome_id', 'alignment', 'score', 'assessed_at']
+
+  # Each sync is written as its own segment, and segments are merged once
+  # there are more than this many.
+  MAX_SEGMENTS = 50
+
+  def __init__(self, directory: str, course_id) -> None:
+    directory = path.join(directory, str(course_id))
+    os.makedirs(directory, exist_ok=True)
+
+    self.store = FrameStore(directory)
+    self.frame = None
+
+
+  def exists(self) -> bool:
+    return bool(self.store.names())
+
+
+  def append(self, results: list, user_ids: list = None) -> None:
+    synced_at = time.time()
+    current = self.current()
+
+    fetched = self.build([{
+      'id': str(r['id']),
+      'outcome_id': str(r['links']['learning_outcome']),
+      'alignment': r['links'].get('alignment'),
+      'user_id': int(r['links']['user']),
+      'score': r.get('score'),
+      'assessed_at': r.get('submitted_or_assessed_at'),
+      'synced_at': synced_at,
+      'removed': False,
+    } for r in results])
+
+    # Only results that are new or changed since the last sync are stored.
+    changed = fetched[~self.keys(fetched, self.VERSION).isin(self.keys(current, self.VERSION))]
+
+    # Results Canvas no longer returns for the students just fetched are
+    # marked removed. A full sync fetches every student known so far.
+    refetched = current if user_ids is None else current[current['user_id'].isin([int(u) for u in user_ids])]
+    gone = refetched[~self.keys(refetched, self.KEY).isin(self.keys(fetched, self.KEY))]
+
+    segment = pd.concat([changed, gone.assign(synced_at=synced_at, removed=True)], ignore_index=True)
+    self.store.write(f'{int(synced_at * 1000):015d}', self.build(segment))
+
+    self.frame = None
+    self.compact()
+
+
+  def compact(self) -> None:
+    names = self.store.names()
+    if len(names) <= self.MAX_SEGMENTS:
+      return
+
+    # The merged segment takes the name of the latest sync, which dates it.
+    self.store.write(names[-1], self.read())
+    for name in names[:-1]:
+      self.store.delete(name)
+
+
+  def read(self) -> pd.DataFrame:
+    if self.frame is None:
+      frames = [df for df in map(self.store.read, self.store.names()) if df is not None]
+
+      # Rows repeat only if a merge was interrupted before cleaning up.
+      self.frame = self.build(pd.concat(frames, ignore_index=True).drop_duplicates() if frames else [])
+    return self.frame
+
+
+  def synced_at(self) -> float:
+    # Segment names record when each sync ran, even if nothing changed.
+    names = self.store.names()
+    return int(names[-1]) / 1000 if names else None
+
+
+  def load(self, max_age: float) -> pd.DataFrame:
+    # None means the history cannot answer, so callers ask Canvas instead.
+    if max_age <= 0 or (synced_at := self.synced_at()) is None:
+      return None
+    if time.time() - synced_at > max_age:
+      return None
+
+    return self.current()
+
+
+  def current(self) -> pd.DataFrame:
+    history = self.read()
+
+    # Each result as last synced, unless it has since been removed.
+    latest = history.sort_values('synced_at', kind='stable').drop_duplicates(self.KEY, keep='last')
+    return latest[~latest['removed']].reset_index(drop=True)
+
+
+  def trends(self, freq: str = 'M') -> pd.DataFrame:
+    history = self.read()
+
+    # Every assessment ever synced counts in the period it was made, even if
+    # Canvas has since replaced or dropped it, so earlier terms keep their
+    # scores. Re-syncs of the same assessment keep only the latest score.
+    results = history[~history['removed']].sort_values('synced_at', kind='stable')
+    results = results.drop_duplicates([*self.KEY, 'assessed_at'], keep='last')
+
+    # Mean score for each outcome in each period results were assessed.
+    assessed = pd.to_datetime(results['assessed_at'], utc=True, errors='coerce')
+    periods = assessed.dt.tz_localize(None).dt.to_period(freq).astype(str)
+    return results.assign(period=periods).pivot_table(
+      index='outcome_id', columns='period', values='score', aggfunc='mean',
+    )
+
+
+  def build(self, rows) -> pd.DataFrame:
+    df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows, columns=self.COLUMNS)
+    return df[self.COLUMNS].astype({
+      'id': 'object', 'outcome_id': 'object', 'alignment': 'object', 'user_id': 'int64',
+      'score': 'float64', 'assessed_at': 'object', 'synced_at': 'float64', 'removed': 'bool',
+    }).reset_index(drop=True)
+
+
+  @staticmethod
+  def keys(df: pd.DataFrame, columns: list) -> pd.MultiIndex:
+    # Compared as text, so missing values match each other.
+    return pd.MultiIndex.from_frame(df[columns].astype(str))
@@ -0,0 +1,162 @@
+import re
+import time
+import logging
+
+from canvas.lazyrecord import lazy_class
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+class Paginator:
+
+  # The largest page size Canvas honors on list endpoints.
+  PER_PAGE = 100
+
+  def __init__(self, paginated, workers: int = None, lazy: bool = False, project = None, where = None,
+    records: list = None) -> None:
+    self.paginated = paginated
+    self.requester = paginated._requester
+
+    # Records already on hand, such as from the course mirror, are built
+    # exactly like fetched pages without making any requests.
+    self.records = records
+
+    # Lazy records only build the attributes that are actually read.
+    self.content_class = lazy_class(paginated._content_class) if lazy else paginated._content_class
+
+    # A projection replaces canvasapi objects with compact records, and a
+    # filter drops records as each page arrives rather than after listing.
+    self.project = project
+    self.where = where
+
+    # The session's rate limiter bounds what is really in flight.
+    limiter = getattr(self.requester._session, 'limiter', None)
+    self.workers = workers or (limiter.maximum if limiter else 4)
+
+    self.latencies = []
+    self.items = 0
+    self.elapsed = 0.0
+
+
+  def __iter__(self):
+    if self.records is not None:
+      yield from self.build(self.records)
+      return
+
+    # Lists with a URL override do not follow the usual link scheme, so
+    # canvasapi pages through them and its objects are projected afterwards.
+    if self.paginated._url_override:
+      for element in self.paginated:
+        if self.project:
+          element = self.project({k: v for k, v in vars(element).items() if k != '_requester'})
+        if not self.where or self.where(element):
+          yield element
+      return
+
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=self.workers)
+
+    try:
+      data, links = self.fetch(self.paginated._first_url, self.first_params())
+
+      # With numbered pages, every remaining page can be requested at once.
+      if urls := self.remaining_pages(links):
+        futures = [executor.submit(self.fetch, url) for url in urls]
+        yield from self.build(data)
+        for future in futures:
+          data, _ = future.result()
+          yield from self.build(data)
+        return
+
+      # Otherwise, fetch the next page while the current one is consumed.
+      while True:
+        next_url = self.endpoint(links.get('next'))
+        future = executor.submit(self.fetch, next_url) if next_url else None
+        yield from self.build(data)
+        if not future:
+          return
+        data, links = future.result()
+    finally:
+      executor.shutdown(wait=False, cancel_futures=True)
+      self.elapsed = time.monotonic() - started
+      logger.debug(f'Paginated {self.paginated}: ' + ', '.join(f'{k}={v}' for k, v in self.stats().items()))
+
+
+  def first_params(self) -> dict:
+    params = dict(self.paginated._first_params)
+
+    # Copy processed arguments, since the requester extends them in place.
+    params['_kwargs'] = [kw for kw in params.get('_kwargs', []) if kw[0] != 'per_page']
+    params['per_page'] = self.PER_PAGE
+    return params
+
+
+  def fetch(self, endpoint: str, params: dict = None) -> (list, dict):
+    started = time.monotonic()
+    response = self.requester.request(self.paginated._request_method, endpoint, **(params or {}))
+    self.latencies.append(time.monotonic() - started)
+
+    data = response.json()
+
+    # Some endpoints paginate in a meta property rather than the headers.
+    links = response.links
+    if not links and isinstance(data, dict) and 'meta' in data:
+      next_url = data['meta'].get('pagination', {}).get('next')
+      links = {'next': {'url': next_url, 'rel': 'next'}} if next_url else {}
+
+    if self.paginated._root:
+      try:
+        data = data[self.paginated._root]
+      except KeyError:
+        raise ValueError(f'The key <{self.paginated._root}> does not exist in the response.')
+
+    return data, links
+
+
+  def endpoint(self, link: dict) -> str:
+    if not link:
+      return None
+    match = re.search(f'{re.escape(self.requester.base_url)}(.*)', link['url'])
+    return match.group(1) if match else None
+
+
+  def remaining_pages(self, links: dict) -> list:
+    last = self.endpoint(links.get('last'))
+    if not last or not links.get('next'):
+      return []
+
+    # Canvas uses opaque bookmarks on some endpoints instead of numbers.
+    parts = urlsplit(last)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    page = dict(query).get('page', '')
+    if not page.isdigit():
+      return []
+
+    return [urlunsplit(parts._replace(query=urlencode([(k, n if k == 'page' else v) for k, v in query])))
+      for n in range(2, int(page) + 1)]
+
+
+  def build(self, data) -> list:
+    elements = []
+    for element in data:
+      if element is None:
+        continue
+      element.update(self.paginated._extra_attribs)
+      record = self.project(element) if self.project else self.content_class(self.requester, element)
+      if not self.where or self.where(record):
+        elements.append(record)
+
+    self.items += len(elements)
+    return elements
+
+
+  def stats(self) -> dict:
+    latencies = self.latencies or [0.0]
+    return {
+      'pages': len(self.latencies),
+      'items': self.items,
+      'seconds': round(self.elapsed, 3),
+      'mean_page_latency': round(sum(latencies) / len(latencies), 3),
+      'max_page_latency': round(max(latencies), 3),
+    }
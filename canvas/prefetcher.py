@@ -0,0 +1,43 @@
+import logging
+
+from canvas import CourseManager
+from canvas.configcourse import ConfigCourse
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+class Prefetcher:
+
+  # Course data most workflows read, and how each one is loaded.
+  LOADS = {
+    'assignments': lambda manager, course: list(manager.paginate(course, 'assignments')),
+    'roster': lambda manager, course: manager.get_roster(course),
+    'outcome_links': lambda manager, course: manager.get_outcome_links(course),
+    'rubrics': lambda manager, course: manager.get_rubric_registry(course),
+  }
+
+  def __init__(self, config: ConfigCourse) -> None:
+    # Connecting and finding the course may ask for an access token, if a
+    # cached one turns out to be invalid, so both happen up front.
+    self.course_manager = CourseManager(config)
+    self.course = self.course_manager.get_course()
+
+    # Everything else loads while menus wait on the user.
+    executor = ThreadPoolExecutor(max_workers=len(self.LOADS), thread_name_prefix='prefetch')
+    self.futures = {name: executor.submit(self._load, name, load) for name, load in self.LOADS.items()}
+    executor.shutdown(wait=False)
+
+
+  def get(self, name: str):
+    if name == 'course':
+      return self.course
+    return self.futures[name].result()
+
+
+  def _load(self, name: str, load):
+    try:
+      return load(self.course_manager, self.course)
+    except Exception as e:
+      # Whoever needs the data fetches it again and sees the error then.
+      logger.warning(f'Prefetching {name} failed: {e}')
+      return None
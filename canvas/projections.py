@@ -0,0 +1,33 @@
+class Projection:
+
+  # Subclasses list only the fields the toolkit reads, so each record is a
+  # few slots instead of a full canvasapi object with a __dict__.
+  __slots__ = ()
+
+  def __init__(self, data: dict) -> None:
+    for name in self.__slots__:
+      setattr(self, name, data.get(name))
+
+
+  def as_dict(self) -> dict:
+    return {name: getattr(self, name) for name in self.__slots__}
+
+
+  def __repr__(self) -> str:
+    fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+    return f'{type(self).__name__}({fields})'
+
+
+class SubmissionScore(Projection):
+  __slots__ = ('id', 'user_id', 'score', 'graded_at')
+
+
+class OutcomeScore(Projection):
+  __slots__ = ('outcome_id', 'alignment', 'user_id', 'score')
+
+  def __init__(self, data: dict) -> None:
+    links = data.get('links', {})
+    self.outcome_id = links.get('learning_outcome')
+    self.alignment = links.get('alignment')
+    self.user_id = int(links['user']) if links.get('user') else None
+    self.score = data.get('score')
@@ -0,0 +1,270 @@
+import math
+import uuid
+import hashlib
+import zipfile
+
+from os import path
+from xml.etree import ElementTree as ET
+
+class QtiPackage:
+
+  # Constants
+  FILE_BASE = '$IMS-CC-FILEBASE$'
+  FILES_DIR = 'Quiz Files'
+  NAMESPACE = 'http://www.imsglobal.org/xsd/ims_qtiasiv1p2'
+
+  def __init__(self, title: str, description: str = '') -> None:
+    self.identifier = f'g{uuid.uuid4().hex}'
+    self.title = title
+    self.description = description
+    self.items = []
+    self.files = {}
+
+
+  def add_figure(self, file_path: str) -> str:
+    # Identical figures are packaged once, however many questions use them.
+    with open(file_path, 'rb') as file:
+      hash = hashlib.sha256(file.read()).hexdigest()
+    name = f'{hash[:12]}-{path.basename(file_path)}'
+    self.files.setdefault(name, file_path)
+
+    return f'<img src="{self.FILE_BASE}/{self.FILES_DIR}/{name}" alt="" />'
+
+
+  def add_question(self, question: dict) -> None:
+    self.items.append(question)
+
+
+  def write(self, file_path: str) -> str:
+    with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+      archive.writestr('imsmanifest.xml', self.build_manifest())
+      archive.writestr(f'{self.identifier}/{self.identifier}.xml', self.build_assessment())
+      for name, source in self.files.items():
+        archive.write(source, f'{self.FILES_DIR}/{name}')
+    return file_path
+
+
+  def build_manifest(self) -> bytes:
+    manifest = ET.Element('manifest', {
+      'identifier': f'{self.identifier}_manifest',
+      'xmlns': 'http://www.imsglobal.org/xsd/imsccv1p1/imscp_v1p1',
+    })
+    metadata = ET.SubElement(manifest, 'metadata')
+    ET.SubElement(metadata, 'schema').text = 'IMS Content'
+    ET.SubElement(metadata, 'schemaversion').text = '1.1.3'
+    ET.SubElement(manifest, 'organizations')
+
+    resources = ET.SubElement(manifest, 'resources')
+    resource = ET.SubElement(resources, 'resource', {'identifier': self.identifier, 'type': 'imsqti_xmlv1p2'})
+    ET.SubElement(resource, 'file', {'href': f'{self.identifier}/{self.identifier}.xml'})
+
+    for i, name in enumerate(self.files):
+      href = f'{self.FILES_DIR}/{name}'
+      resource = ET.SubElement(resources, 'resource', {'identifier': f'{self.identifier}_f{i}', 'type': 'webcontent', 'href': href})
+      ET.SubElement(resource, 'file', {'href': href})
+
+    return ET.tostring(manifest, encoding='utf-8', xml_declaration=True)
+
+
+  def build_assessment(self) -> bytes:
+    root = ET.Element('questestinterop', {'xmlns': self.NAMESPACE})
+    assessment = ET.SubElement(root, 'assessment', {'ident': self.identifier, 'title': self.title})
+    self.add_metadata(assessment, 'qtimetadata', {'cc_maxattempts': '1'})
+
+    if self.description:
+      flow = ET.SubElement(ET.SubElement(assessment, 'presentation_material'), 'flow_mat')
+      self.add_material(flow, self.description)
+
+    section = ET.SubElement(assessment, 'section', {'ident': 'root_section'})
+    for i, question in enumerate(self.items, 1):
+      self.build_item(section, question, f'{self.identifier}_q{i}')
+
+    return ET.tostring(root, encoding='utf-8', xml_declaration=True)
+
+
+  def build_item(self, section, question: dict, ident: str) -> None:
+    type = question['question_type']
+    item = ET.SubElement(section, 'item', {'ident': ident, 'title': question.get('question_name', '')})
+    self.add_metadata(ET.SubElement(item, 'itemmetadata'), 'qtimetadata', {
+      'question_type': type,
+      'points_possible': str(float(question.get('points_possible') or 0)),
+    })
+
+    presentation = ET.SubElement(item, 'presentation')
+    self.add_material(presentation, question.get('question_text', ''))
+
+    processing = ET.SubElement(item, 'resprocessing')
+    outcomes = ET.SubElement(processing, 'outcomes')
+    ET.SubElement(outcomes, 'decvar', {'maxvalue': '100', 'minvalue': '0', 'varname': 'SCORE', 'vartype': 'Decimal'})
+
+    answers = [{**answer, 'ident': f'{ident}_a{i}'} for i, answer in enumerate(question.get('answers', []), 1)]
+
+    builders = {
+      'multiple_choice_question': self.build_choice,
+      'multiple_answers_question': self.build_choice,
+      'matching_question': self.build_matching,
+      'fill_in_multiple_blanks_question': self.build_blanks,
+      'multiple_dropdowns_question': self.build_blanks,
+      'numerical_question': self.build_numerical,
+    }
+    if type not in builders:
+      raise ValueError(f'Question type {type} cannot be packaged as QTI.')
+    builders[type](presentation, processing, question, answers, ident)
+
+    # Answer comments show once a student has chosen that answer.
+    for answer in answers:
+      if comment := answer.get('answer_comment_html'):
+        feedback = ET.SubElement(item, 'itemfeedback', {'ident': f'{answer["ident"]}_fb'})
+        self.add_material(ET.SubElement(feedback, 'flow_mat'), comment)
+
+
+  def build_choice(self, presentation, processing, question: dict, answers: list, ident: str) -> None:
+    multiple = question['question_type'] == 'multiple_answers_question'
+    response = ET.SubElement(presentation, 'response_lid', {
+      'ident': 'response1',
+      'rcardinality': 'Multiple' if multiple else 'Single',
+    })
+    choices = ET.SubElement(response, 'render_choice')
+    for answer in answers:
+      label = ET.SubElement(choices, 'response_label', {'ident': answer['ident']})
+      self.add_material(label, answer.get('answer_html', answer.get('answer_text', '')))
+
+    self.add_feedback(processing, 'response1', answers)
+
+    correct = [a for a in answers if a.get('answer_weight', 0) > 0]
+    respcondition, condition = self.add_condition(processing, 'No')
+
+    if multiple:
+      # Every correct answer, and none of the others, must be chosen.
+      condition = ET.SubElement(condition, 'and')
+      for answer in answers:
+        parent = condition if answer in correct else ET.SubElement(condition, 'not')
+        ET.SubElement(parent, 'varequal', {'respident': 'response1'}).text = answer['ident']
+    else:
+      for answer in correct[:1]:
+        ET.SubElement(condition, 'varequal', {'respident': 'response1'}).text = answer['ident']
+
+    self.set_score(respcondition, '100', 'Set')
+
+
+  def build_matching(self, presentation, processing, question: dict, answers: list, ident: str) -> None:
+    # Every left side chooses from all right sides, plus any distractors.
+    rights = list(dict.fromkeys(
+      [a.get('answer_match_right', '') for a in answers]
+      + [d for d in question.get('matching_answer_incorrect_matches', '').split('\n') if d]
+    ))
+    matches = {right: f'{ident}_m{i}' for i, right in enumerate(rights, 1)}
+
+    for answer in answers:
+      response = ET.SubElement(presentation, 'response_lid', {'ident': f'response_{answer["ident"]}'})
+      self.add_material(response, answer.get('answer_match_left_html', ''))
+      choices = ET.SubElement(response, 'render_choice')
+      for right, match in matches.items():
+        label = ET.SubElement(choices, 'response_label', {'ident': match})
+        self.add_material(label, right, 'text/plain')
+
+    for answer in answers:
+      respcondition, condition = self.add_condition(processing)
+      ET.SubElement(condition, 'varequal', {'respident': f'response_{answer["ident"]}'}).text = matches[answer.get('answer_match_right', '')]
+      self.set_score(respcondition, self.share(len(answers)), 'Add')
+
+
+  def build_blanks(self, presentation, processing, question: dict, answers: list, ident: str) -> None:
+    # Each blank is its own response, scored as a share of the question.
+    blanks = {}
+    for answer in answers:
+      blanks.setdefault(answer.get('blank_id'), []).append(answer)
+
+    for blank, options in blanks.items():
+      response = ET.SubElement(presentation, 'response_lid', {'ident': f'response_{blank}'})
+      self.add_material(response, str(blank), 'text/plain')
+      choices = ET.SubElement(response, 'render_choice')
+      for answer in options:
+        label = ET.SubElement(choices, 'response_label', {'ident': answer['ident']})
+        self.add_material(label, answer.get('answer_text', ''), 'text/plain')
+
+    for blank, options in blanks.items():
+      for answer in options:
+        if answer.get('answer_weight', 0) <= 0:
+          continue
+        respcondition, condition = self.add_condition(processing)
+        ET.SubElement(condition, 'varequal', {'respident': f'response_{blank}'}).text = answer['ident']
+        self.set_score(respcondition, self.share(len(blanks)), 'Add')
+
+
+  def build_numerical(self, presentation, processing, question: dict, answers: list, ident: str) -> None:
+    response = ET.SubElement(presentation, 'response_str', {'ident': 'response1', 'rcardinality': 'Single'})
+    ET.SubElement(ET.SubElement(response, 'render_fib', {'fibtype': 'Decimal'}), 'response_label', {'ident': 'answer1'})
+
+    self.add_feedback(processing, 'response1', answers)
+
+    for answer in answers:
+      respcondition, condition = self.add_condition(processing, 'No')
+      type = answer.get('numerical_answer_type', 'exact_answer')
+
+      if type == 'range_answer':
+        self.add_range(condition, answer.get('answer_range_start'), answer.get('answer_range_end'))
+      else:
+        if type == 'precision_answer':
+          # QTI has no notion of significant digits, so the answer is kept as
+          # the range of values that round to it.
+          value = float(answer.get('answer_approximate') or 0)
+          digits = int(answer.get('answer_precision') or 1)
+          magnitude = math.floor(math.log10(abs(value))) if value else 0
+          margin = 0.5 * 10 ** (magnitude - digits + 1)
+        else:
+          value = float(answer.get('answer_exact') or 0)
+          margin = float(answer.get('answer_error_margin') or 0)
+
+        either = ET.SubElement(condition, 'or')
+        ET.SubElement(either, 'varequal', {'respident': 'response1'}).text = self.number(value)
+        self.add_range(ET.SubElement(either, 'and'), value - margin, value + margin)
+
+      self.set_score(respcondition, '100', 'Set')
+
+
+  def add_metadata(self, parent, tag: str, fields: dict) -> None:
+    metadata = ET.SubElement(parent, tag)
+    for label, entry in fields.items():
+      field = ET.SubElement(metadata, 'qtimetadatafield')
+      ET.SubElement(field, 'fieldlabel').text = label
+      ET.SubElement(field, 'fieldentry').text = entry
+
+
+  def add_material(self, parent, text: str, texttype: str = 'text/html') -> None:
+    material = ET.SubElement(parent, 'material')
+    ET.SubElement(material, 'mattext', {'texttype': texttype}).text = str(text)
+
+
+  def add_feedback(self, processing, respident: str, answers: list) -> None:
+    for answer in answers:
+      if not answer.get('answer_comment_html'):
+        continue
+      respcondition, condition = self.add_condition(processing, 'Yes')
+      ET.SubElement(condition, 'varequal', {'respident': respident}).text = answer['ident']
+      ET.SubElement(respcondition, 'displayfeedback', {'feedbacktype': 'Response', 'linkrefid': f'{answer["ident"]}_fb'})
+
+
+  def add_range(self, parent, start, end) -> None:
+    ET.SubElement(parent, 'vargte', {'respident': 'response1'}).text = self.number(start)
+    ET.SubElement(parent, 'varlte', {'respident': 'response1'}).text = self.number(end)
+
+
+  def add_condition(self, processing, next: str = None) -> tuple:
+    # Conditions that stop processing are marked, so later ones are skipped.
+    respcondition = ET.SubElement(processing, 'respcondition', {'continue': next} if next else {})
+    return respcondition, ET.SubElement(respcondition, 'conditionvar')
+
+
+  def set_score(self, respcondition, value: str, action: str) -> None:
+    ET.SubElement(respcondition, 'setvar', {'action': action, 'varname': 'SCORE'}).text = value
+
+
+  @staticmethod
+  def share(count: int) -> str:
+    return f'{100 / max(count, 1):.2f}'
+
+
+  @staticmethod
+  def number(value) -> str:
+    return f'{float(value or 0):g}'
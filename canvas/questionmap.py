@@ -0,0 +1,41 @@
+import os
+import json
+import hashlib
+
+from os import path
+
+class QuestionMap:
+
+  # Constants
+  MAP_FILE = 'question-outcomes.json'
+
+  def __init__(self, directory: str) -> None:
+    self.map_path = path.join(directory, self.MAP_FILE)
+
+
+  @staticmethod
+  def key(course_id, columns: list) -> str:
+    # The same exam template has the same question columns in every section.
+    return hashlib.sha256('\n'.join([str(course_id), *map(str, columns)]).encode()).hexdigest()
+
+
+  def get(self, key: str) -> dict:
+    return self._read().get(key)
+
+
+  def set(self, key: str, matches: dict) -> None:
+    entries = self._read()
+    entries[key] = matches
+
+    temp_path = f'{self.map_path}.tmp'
+    with open(temp_path, 'w') as file:
+      json.dump(entries, file)
+    os.replace(temp_path, self.map_path)
+
+
+  def _read(self) -> dict:
+    if not path.isfile(self.map_path):
+      return {}
+
+    with open(self.map_path) as file:
+      return json.load(file)
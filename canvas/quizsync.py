@@ -0,0 +1,143 @@
+import os
+import json
+import asyncio
+import hashlib
+import threading
+
+from os import path
+
+class QuizSync:
+
+  # Question fields as Canvas returns them, compared to notice edits made
+  # in Canvas since the toolkit last wrote a question.
+  FIELDS = [
+    'question_name', 'question_text', 'question_type', 'points_possible', 'answers',
+    'correct_comments', 'incorrect_comments', 'neutral_comments',
+    'correct_comments_html', 'incorrect_comments_html', 'neutral_comments_html',
+    'matching_answer_incorrect_matches',
+  ]
+
+  def __init__(self, course_manager, directory: str, quiz) -> None:
+    self.course_manager = course_manager
+    self.quiz = quiz
+    self.map_path = path.join(directory, f'{quiz.id}.json')
+    self.lock = threading.Lock()
+
+    # For each question ID, the hash of the payload it was last written with
+    # and of the question Canvas returned for it.
+    self.hashes = {}
+    if path.isfile(self.map_path):
+      with open(self.map_path) as file:
+        self.hashes = json.load(file)
+
+
+  @staticmethod
+  def hash(question: dict) -> str:
+    return hashlib.sha256(json.dumps(question, sort_keys=True).encode()).hexdigest()
+
+
+  @classmethod
+  def fingerprint(cls, question) -> str:
+    return cls.hash({field: getattr(question, field, None) for field in cls.FIELDS})
+
+
+  def record(self, written: list) -> None:
+    # Remember questions as written, whichever way they reached the quiz.
+    with self.lock:
+      for existing, question in written:
+        self.hashes[str(existing.id)] = {'payload': self.hash(question), 'canvas': self.fingerprint(existing)}
+      self.save()
+
+
+  def is_unchanged(self, existing) -> str:
+    # Questions edited in Canvas no longer match what was written.
+    entry = self.hashes.get(str(existing.id))
+    if not isinstance(entry, dict) or entry['canvas'] != self.fingerprint(existing):
+      return None
+    return entry['payload']
+
+
+  def plan(self, questions: list) -> dict:
+    plan = {'keep': [], 'move': [], 'update': [], 'create': [], 'delete': []}
+    self.existing = sorted(self.quiz.get_questions(), key=lambda q: getattr(q, 'position', None) or 0)
+
+    # Unchanged questions are found by hash, wherever they are in the quiz.
+    unchanged = {}
+    for existing in self.existing:
+      if hash := self.is_unchanged(existing):
+        unchanged.setdefault(hash, []).append(existing)
+
+    changed = []
+    used = set()
+    for position, question in enumerate(questions, 1):
+      hash = self.hash(question)
+      if unchanged.get(hash):
+        existing = unchanged[hash].pop(0)
+        used.add(existing.id)
+        moved = getattr(existing, 'position', None) != position
+        plan['move' if moved else 'keep'].append((existing, question, position))
+      else:
+        changed.append((question, position))
+
+    # Changed questions are written over the old question in their position,
+    # then over any other leftover question, and are only created after that.
+    leftover = {q.id: q for q in self.existing if q.id not in used}
+    positions = {getattr(q, 'position', None): q.id for q in leftover.values()}
+    for question, position in changed:
+      id = positions.get(position)
+      id = id if id in leftover else next(iter(leftover), None)
+      if id is not None:
+        plan['update'].append((leftover.pop(id), question, position))
+      else:
+        plan['create'].append((None, question, position))
+
+    plan['delete'] = list(leftover.values())
+
+    return plan
+
+
+  def apply(self, plan: dict) -> dict:
+    client = self.course_manager.get_async_client()
+
+    async def write(existing, question, position):
+      if existing:
+        await client.edit_question(existing, {**question, 'position': position})
+        return existing
+      return await client.create_question(self.quiz, {**question, 'position': position})
+
+    # Moved questions are rewritten whole, since edits replace question data.
+    writes = plan['move'] + plan['update'] + plan['create']
+    results = asyncio.run(client.gather(
+      *[write(*item) for item in writes],
+      *[client.delete_question(existing) for existing in plan['delete']],
+      return_exceptions=True,
+    ))
+
+    failures = {}
+    written = [(existing, question) for existing, question, _ in plan['keep']]
+
+    for (existing, question, position), result in zip(writes, results):
+      if isinstance(result, Exception):
+        failures[position] = result
+        continue
+      written.append((result, question))
+
+    # Questions that could not be deleted keep what is known about them.
+    kept = {}
+    for existing, result in zip(plan['delete'], results[len(writes):]):
+      if isinstance(result, Exception):
+        failures[getattr(existing, 'position', None)] = result
+        if entry := self.hashes.get(str(existing.id)):
+          kept[str(existing.id)] = entry
+
+    self.hashes = kept
+    self.record(written)
+
+    return failures
+
+
+  def save(self) -> None:
+    temp_path = f'{self.map_path}.tmp'
+    with open(temp_path, 'w') as file:
+      json.dump(self.hashes, file)
+    os.replace(temp_path, self.map_path)
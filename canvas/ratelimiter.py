@@ -0,0 +1,93 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+
+  # Canvas throttles per access token using a leaky bucket of request
+  # cost. Below this many remaining units, the limiter backs off.
+  LOW_WATER = 150.0
+
+  def __init__(self, maximum: int = 8, initial: int = 2) -> None:
+    self.maximum = max(int(maximum), 1)
+    self.limit = float(min(initial, self.maximum))
+    self.in_flight = 0
+    self.remaining = None
+    self.cost = 0.0
+    self.increases = 0
+    self.decreases = 0
+    self.throttles = 0
+    self.condition = threading.Condition()
+
+
+  def acquire(self) -> None:
+    with self.condition:
+      while self.in_flight >= int(self.limit):
+        self.condition.wait()
+      self.in_flight += 1
+
+
+  def release(self, response = None) -> None:
+    with self.condition:
+      self.in_flight -= 1
+      if response is not None:
+        self.observe(response)
+      self.condition.notify_all()
+
+
+  def observe(self, response) -> None:
+    if response.status_code == 403 and b'Rate Limit Exceeded' in (response.content or b''):
+      self.throttles += 1
+      self.decrease('throttled')
+      return
+
+    remaining = response.headers.get('X-Rate-Limit-Remaining')
+    cost = response.headers.get('X-Request-Cost')
+
+    # Responses from outside Canvas, such as file uploads, carry no quota.
+    if remaining is None:
+      return
+
+    try:
+      self.remaining = float(remaining)
+      if cost is not None:
+        # Keep a moving average of what a single request costs.
+        self.cost = float(cost) if not self.cost else 0.8 * self.cost + 0.2 * float(cost)
+    except ValueError:
+      return
+
+    # Back off when the bucket cannot absorb a full window of requests.
+    if self.remaining < self.LOW_WATER or self.remaining < self.cost * self.limit:
+      self.decrease(f'{self.remaining:.0f} remaining')
+      return
+
+    self.increase()
+
+
+  def increase(self) -> None:
+    if self.limit >= self.maximum:
+      return
+    # Additive increase of roughly one slot per window of responses.
+    self.limit = min(self.limit + 1 / self.limit, self.maximum)
+    self.increases += 1
+
+
+  def decrease(self, reason: str) -> None:
+    # Multiplicative decrease, never below one request in flight.
+    self.limit = max(self.limit / 2, 1.0)
+    self.decreases += 1
+    logger.debug(f'Rate limit decreased to {int(self.limit)} in flight ({reason}).')
+
+
+  def stats(self) -> dict:
+    with self.condition:
+      return {
+        'limit': int(self.limit),
+        'in_flight': self.in_flight,
+        'remaining': self.remaining,
+        'request_cost': round(self.cost, 3),
+        'increases': self.increases,
+        'decreases': self.decreases,
+        'throttles': self.throttles,
+      }
@@ -0,0 +1,211 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import requests
+import threading
+
+from os import path
+from urllib.parse import urlsplit
+from requests.structures import CaseInsensitiveDict
+
+class ResponseCache:
+
+  # Constants
+  CACHE_FILE = 'responses.sqlite'
+
+  # Seconds a cached listing is served without asking Canvas at all. Anything
+  # not listed here is always revalidated with If-None-Match/If-Modified-Since.
+  TTLS = [
+    (re.compile(r'/outcomes/[0-9]+$'), 86400),
+    (re.compile(r'/outcome_group_links$'), 3600),
+    (re.compile(r'/users$'), 900),
+    (re.compile(r'/rubrics$'), 600),
+    (re.compile(r'/assignment_groups$'), 600),
+    (re.compile(r'/assignments$'), 120),
+    (re.compile(r'/quizzes$'), 120),
+  ]
+
+  # Responses that change on every request are never stored.
+  NO_STORE = [
+    re.compile(r'/progress/[0-9]+$'),
+    re.compile(r'/users/self$'),
+  ]
+
+  # One cache per directory for the whole process, since pooled sessions
+  # keep the first cache they were given.
+  instances = {}
+  instances_lock = threading.Lock()
+
+  @classmethod
+  def shared(cls, directory: str, max_size: int = 100 * 1024 * 1024) -> 'ResponseCache':
+    with cls.instances_lock:
+      key = path.abspath(directory)
+      if key not in cls.instances:
+        cls.instances[key] = cls(directory, max_size=max_size)
+      cls.instances[key].max_size = max_size
+      return cls.instances[key]
+
+
+  def __init__(self, directory: str, max_size: int = 100 * 1024 * 1024) -> None:
+    self.cache_path = path.join(directory, self.CACHE_FILE)
+    self.max_size = max_size
+    self.lock = threading.Lock()
+
+    self.db = sqlite3.connect(self.cache_path, check_same_thread=False, isolation_level=None)
+    os.chmod(self.cache_path, 0o600)
+    self.db.executescript('''
+      PRAGMA journal_mode = WAL;
+      PRAGMA synchronous = NORMAL;
+      CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        path TEXT NOT NULL,
+        headers TEXT NOT NULL,
+        body BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        stored_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+      );
+      CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+      CREATE INDEX IF NOT EXISTS entries_path ON entries (path);
+      CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+    ''')
+
+
+  def request(self, send, method, url, **kwargs) -> requests.Response:
+    full_url = requests.Request(method, url, params=kwargs.get('params')).prepare().url
+    url_path = urlsplit(full_url).path
+
+    if any(p.search(url_path) for p in self.NO_STORE):
+      return send(method, url, **kwargs)
+
+    # Keep each access token's view of Canvas separate.
+    headers = dict(kwargs.get('headers') or {})
+    key = hashlib.sha256(f'{headers.get("Authorization", "")} {full_url}'.encode()).hexdigest()
+
+    entry = self.get(key)
+
+    if entry and time.time() - entry['stored_at'] < self.ttl(url_path):
+      self.count('hits')
+      return self.build(full_url, entry)
+
+    if entry:
+      if etag := entry['headers'].get('ETag'):
+        headers['If-None-Match'] = etag
+      if modified := entry['headers'].get('Last-Modified'):
+        headers['If-Modified-Since'] = modified
+
+    response = send(method, url, **{**kwargs, 'headers': headers})
+
+    if response.status_code == 304 and entry:
+      self.count('revalidations')
+      self.refresh(key)
+      return self.build(full_url, entry)
+
+    self.count('misses')
+
+    if response.status_code == 200:
+      self.store(key, url_path, response)
+
+    return response
+
+
+  def ttl(self, url_path: str) -> int:
+    return next((ttl for pattern, ttl in self.TTLS if pattern.search(url_path)), 0)
+
+
+  def get(self, key: str) -> dict:
+    with self.lock:
+      row = self.db.execute('SELECT headers, body, stored_at FROM entries WHERE key = ?', (key,)).fetchone()
+      if not row:
+        return None
+      self.db.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (time.time(), key))
+
+    return {'headers': CaseInsensitiveDict(json.loads(row[0])), 'body': row[1], 'stored_at': row[2]}
+
+
+  def build(self, url: str, entry: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    response._content = entry['body']
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+  def store(self, key: str, url_path: str, response: requests.Response) -> None:
+    now = time.time()
+    body = response.content
+
+    with self.lock:
+      self.db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)', (
+        key, url_path, json.dumps(dict(response.headers)), body, len(body), now, now,
+      ))
+      self.evict()
+
+
+  def refresh(self, key: str) -> None:
+    with self.lock:
+      self.db.execute('UPDATE entries SET stored_at = ? WHERE key = ?', (time.time(), key))
+
+
+  def invalidate(self, url: str) -> None:
+    # A write to any resource stales listings of its collection, such as
+    # courses/1/assignments after editing courses/1/assignments/2.
+    segments = urlsplit(url).path.split('/api/v1/', 1)[-1].strip('/').split('/')
+    prefix = '/api/v1/' + '/'.join(segments[:3])
+
+    with self.lock:
+      self.db.execute('DELETE FROM entries WHERE path = ? OR path LIKE ?', (prefix, prefix + '/%'))
+
+
+  def evict(self) -> None:
+    # Least recently used entries go first once the cache is too large.
+    total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+    evicted = 0
+
+    while total > self.max_size:
+      row = self.db.execute('SELECT key, size FROM entries ORDER BY accessed_at LIMIT 1').fetchone()
+      if not row:
+        break
+      self.db.execute('DELETE FROM entries WHERE key = ?', (row[0],))
+      total -= row[1]
+      evicted += 1
+
+    if evicted:
+      self._count('evictions', evicted)
+
+
+  def count(self, name: str) -> None:
+    with self.lock:
+      self._count(name, 1)
+
+
+  def _count(self, name: str, amount: int) -> None:
+    self.db.execute(
+      'INSERT INTO counters VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + ?',
+      (name, amount, amount),
+    )
+
+
+  def stats(self) -> dict:
+    with self.lock:
+      entries, size = self.db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+      counters = dict(self.db.execute('SELECT name, value FROM counters').fetchall())
+
+    return {
+      'entries': entries,
+      'size_mb': round(size / 1024 / 1024, 2),
+      'max_size_mb': round(self.max_size / 1024 / 1024, 2),
+      **{name: counters.get(name, 0) for name in ['hits', 'revalidations', 'misses', 'evictions']},
+    }
+
+
+  def clear(self) -> None:
+    with self.lock:
+      self.db.execute('DELETE FROM entries')
+      self.db.execute('DELETE FROM counters')
+      self.db.execute('VACUUM')
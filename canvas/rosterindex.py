@@ -0,0 +1,72 @@
+import os
+import json
+import time
+import hashlib
+import pandas as pd
+
+from os import path
+from typing import Self
+
+class RosterIndex:
+
+  # Fields kept for each student.
+  FIELDS = ['id', 'email', 'sortable_name', 'sis_user_id', 'login_id']
+
+  def __init__(self, students: list) -> None:
+    self.students = [{field: s.get(field) for field in self.FIELDS} for s in students]
+
+    # Emails are matched regardless of case or stray whitespace.
+    self.emails = {self.normalize(s['email']): s['id'] for s in self.students if s['email']}
+    self.sis_ids = {str(s['sis_user_id']): s['id'] for s in self.students if s['sis_user_id']}
+    self.login_ids = {self.normalize(s['login_id']): s['id'] for s in self.students if s['login_id']}
+
+    # Changes whenever anyone joins, leaves or changes an identifier.
+    self.version = hashlib.sha256(json.dumps(sorted(self.students, key=lambda s: s['id'])).encode()).hexdigest()
+
+
+  @staticmethod
+  def normalize(value) -> str:
+    return str(value).strip().casefold()
+
+
+  def by_email(self, email: str) -> int:
+    return self.emails.get(self.normalize(email))
+
+
+  def by_sis_id(self, sis_id) -> int:
+    return self.sis_ids.get(str(sis_id))
+
+
+  def by_login_id(self, login_id: str) -> int:
+    return self.login_ids.get(self.normalize(login_id))
+
+
+  def join(self, df_data: pd.DataFrame, on: str = 'Email') -> pd.DataFrame:
+    # Map a column of emails to Canvas user IDs in one pass, dropping rows
+    # without a match, and index the result by user ID.
+    user_ids = df_data[on].astype(str).str.strip().str.casefold().map(self.emails)
+    df_mapped = df_data.assign(user_id=user_ids).dropna(subset=['user_id'])
+    return df_mapped.astype({'user_id': 'int64'}).set_index('user_id')
+
+
+  @classmethod
+  def load(cls, file_path: str, ttl: int) -> Self:
+    if ttl <= 0 or not path.isfile(file_path):
+      return None
+
+    with open(file_path) as file:
+      entry = json.load(file)
+
+    if time.time() - entry.get('fetched_at', 0) > ttl:
+      return None
+
+    return cls(entry['students'])
+
+
+  def save(self, file_path: str) -> None:
+    # Emails and SIS IDs are readable and writable by the current user only.
+    temp_path = f'{file_path}.tmp'
+    descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, 'w') as file:
+      json.dump({'fetched_at': time.time(), 'students': self.students}, file)
+    os.replace(temp_path, file_path)
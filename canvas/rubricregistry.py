@@ -0,0 +1,68 @@
+import json
+import hashlib
+import threading
+
+from canvasapi.rubric import Rubric
+
+class RubricRegistry:
+
+  def __init__(self, course_manager, course) -> None:
+    self.course_manager = course_manager
+    self.course = course
+    self.lock = threading.Lock()
+
+    # Index the course's rubrics by what they assess rather than by title.
+    self.rubrics = list(course_manager.paginate(course, 'rubrics'))
+    self.index = {}
+    for rubric in self.rubrics:
+      self.index.setdefault(self.fingerprint(getattr(rubric, 'data', [])), rubric)
+
+
+  @staticmethod
+  def fingerprint(criteria) -> str:
+    # Canvas returns criteria and ratings as lists, while requests send
+    # them as indexed objects. Both hash the same when they match.
+    values = lambda items: [items[k] for k in sorted(items, key=int)] if isinstance(items, dict) else items
+
+    # Descriptions count too, since graders match criteria to questions by
+    # description and a retitled outcome needs a new rubric.
+    describe = lambda item: str(item.get('description') or '').strip()
+
+    normalized = [{
+      'outcome': str(c.get('learning_outcome_id') or ''),
+      'description': describe(c),
+      'points': float(c.get('points') or 0),
+      'ratings': sorted(
+        [(describe(r), float(r.get('points') or 0)) for r in values(c.get('ratings', []))],
+        key=lambda r: (-r[1], r[0]),
+      ),
+    } for c in values(criteria)]
+
+    return hashlib.sha256(json.dumps(normalized).encode()).hexdigest()
+
+
+  def find(self, criteria) -> Rubric:
+    return self.index.get(self.fingerprint(criteria))
+
+
+  def apply(self, rubric: dict, rubric_association: dict, current_id = None) -> Rubric:
+    existing = self.find(rubric['criteria'])
+
+    if not existing:
+      created = self.course.create_rubric(rubric=rubric, rubric_association=rubric_association)['rubric']
+      with self.lock:
+        self.rubrics.append(created)
+        self.index[self.fingerprint(created.data)] = created
+      self.course_manager.expire_mirror(self.course, 'rubrics')
+      return created
+
+    # A matching rubric already in the course needs no course association,
+    # and one already on the assignment needs nothing at all.
+    if rubric_association.get('association_type') == 'Course' or existing.id == current_id:
+      return existing
+
+    self.course.create_rubric_association(rubric_association={
+      **rubric_association,
+      'rubric_id': existing.id,
+    })
+    return existing
@@ -0,0 +1,40 @@
+import hashlib
+import pandas as pd
+
+from canvas.framestore import FrameStore
+
+class ScoreCache:
+
+  # Constants
+  INDEX = 'user_id'
+  MAX_ENTRIES = 50
+
+  def __init__(self, directory: str) -> None:
+    self.store = FrameStore(directory)
+
+
+  @staticmethod
+  def key(data_path: str, *parts: str) -> str:
+    # Exports are keyed by content, so a renamed or re-downloaded copy of
+    # the same file is still a hit and an edited one never is.
+    digest = hashlib.sha256()
+    with open(data_path, 'rb') as file:
+      for block in iter(lambda: file.read(1 << 20), b''):
+        digest.update(block)
+    for part in parts:
+      digest.update(f'\n{part}'.encode())
+    return digest.hexdigest()
+
+
+  def get(self, data_path: str, parse, *parts: str) -> pd.DataFrame:
+    key = self.key(data_path, *parts)
+
+    df = self.store.read(key, index=self.INDEX)
+    if df is not None:
+      return df
+
+    df = parse(data_path)
+    if df is not None:
+      self.store.write(key, df, index=self.INDEX)
+      self.store.prune(self.MAX_ENTRIES)
+    return df
@@ -0,0 +1,74 @@
+import os
+import json
+import time
+import logging
+
+from os import path
+
+logger = logging.getLogger(__name__)
+
+class SessionCache:
+
+  # Constants
+  CACHE_FILE = 'session'
+  LEGACY_KEY_FILE = 'session.key'
+
+  def __init__(self, directory: str, ttl: int = 900) -> None:
+    self.cache_path = path.join(directory, self.CACHE_FILE)
+    self.ttl = ttl
+
+    # Earlier caches were encrypted with a key kept next to them.
+    legacy_key_path = path.join(directory, self.LEGACY_KEY_FILE)
+    if path.isfile(legacy_key_path):
+      os.remove(legacy_key_path)
+
+
+  def load(self, base_url: str) -> tuple[str, dict] | None:
+    entry = self._read().get(base_url)
+
+    if not entry or time.time() - entry.get('validated_at', 0) > self.ttl:
+      return None
+
+    return entry['token'], entry['user']
+
+
+  def save(self, base_url: str, token: str, user: dict) -> None:
+    entries = self._read()
+    entries[base_url] = {
+      'token': token,
+      'user': user,
+      'validated_at': time.time(),
+    }
+    self._write(entries)
+
+
+  def invalidate(self, base_url: str) -> None:
+    entries = self._read()
+    if entries.pop(base_url, None):
+      self._write(entries)
+
+
+  def _read(self) -> dict:
+    if self.ttl <= 0 or not path.isfile(self.cache_path):
+      return {}
+
+    try:
+      with open(self.cache_path) as file:
+        return json.load(file)
+    except Exception:
+      # A corrupt or foreign cache is simply discarded.
+      logger.warning('Discarding unreadable session cache.')
+      return {}
+
+
+  def _write(self, entries: dict) -> None:
+    if self.ttl <= 0:
+      return
+
+    # Readable and writable by the current user only, like the keyring entry
+    # it stands in for. Replacing the file also tightens an older one.
+    temp_path = f'{self.cache_path}.tmp'
+    descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, 'w') as file:
+      json.dump(entries, file)
+    os.replace(temp_path, self.cache_path)
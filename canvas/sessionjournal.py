@@ -0,0 +1,69 @@
+import os
+import io
+import json
+import time
+import pandas as pd
+
+from os import path
+
+class SessionJournal:
+
+  def __init__(self, file_path: str, resume: bool = False) -> None:
+    self.file_path = file_path
+    self.entries = {}
+
+    # Without resuming, the previous journal is replaced on the first record.
+    if resume and path.isfile(self.file_path):
+      with open(self.file_path) as file:
+        self.entries = json.load(file)
+      saved_at = time.strftime('%m/%d/%Y at %H:%M:%S', time.localtime(self.entries.get('saved_at', 0)))
+      print(f'Resuming session saved {saved_at}.')
+    elif resume:
+      print('No session to resume. Starting over.')
+
+
+  @staticmethod
+  def get_path(directory: str, course_id, name: str) -> str:
+    return path.join(directory, f'{course_id}-{name}.json')
+
+
+  def __contains__(self, key: str) -> bool:
+    return key in self.entries
+
+
+  def get(self, key: str, fallback = None):
+    return self.entries.get(key, fallback)
+
+
+  def record(self, key: str, value):
+    self.entries[key] = value
+    self.entries['saved_at'] = time.time()
+
+    # Write to a temporary file first, so a crash never leaves half a journal.
+    # Journaled frames hold student details, so only the current user may
+    # read it.
+    temp_path = f'{self.file_path}.tmp'
+    descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, 'w') as file:
+      json.dump(self.entries, file)
+    os.replace(temp_path, self.file_path)
+
+    return value
+
+
+  def get_frame(self, key: str) -> pd.DataFrame:
+    if key not in self.entries:
+      return None
+    return pd.read_json(io.StringIO(self.entries[key]), orient='table')
+
+
+  def record_frame(self, key: str, df: pd.DataFrame) -> pd.DataFrame:
+    self.record(key, df.to_json(orient='table'))
+    return df
+
+
+  def clear(self) -> None:
+    # A finished session has nothing left to resume.
+    self.entries = {}
+    if path.isfile(self.file_path):
+      os.remove(self.file_path)
@@ -0,0 +1,178 @@
+import atexit
+import logging
+import requests
+import threading
+
+from requests.adapters import HTTPAdapter
+from canvas.jsondecoder import JsonDecoder
+from canvas.ratelimiter import RateLimiter
+from canvas.responsecache import ResponseCache
+from canvas.retrypolicy import CircuitBreaker, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+class CanvasSession(requests.Session):
+
+  def __init__(self, base_url: str, limiter: RateLimiter, retry: RetryPolicy, breaker: CircuitBreaker,
+    cache: ResponseCache = None, decoder: JsonDecoder = None) -> None:
+    super().__init__()
+    self.base_url = base_url
+    self.decoder = decoder or JsonDecoder()
+    self.limiter = limiter
+    self.retry = retry
+    self.breaker = breaker
+    self.cache = cache
+
+
+  def request(self, method, url, *args, **kwargs) -> requests.Response:
+    response = self.cached_request(method, url, *args, **kwargs)
+    self.decoder.bind(response)
+    return response
+
+
+  def cached_request(self, method, url, *args, **kwargs) -> requests.Response:
+    if not self.cache or not url.startswith(self.base_url):
+      return self.send_request(method, url, *args, **kwargs)
+
+    # Reads may be answered from disk, and writes stale what was read.
+    if method.upper() == 'GET':
+      return self.cache.request(self.send_request, method, url, **kwargs)
+
+    response = self.send_request(method, url, *args, **kwargs)
+    if response.ok:
+      self.cache.invalidate(url)
+    return response
+
+
+  def send_request(self, method, url, *args, **kwargs) -> requests.Response:
+    attempt = 0
+    delay = 0.0
+
+    while True:
+      trial = self.breaker.check()
+
+      # Every request holds a limiter slot until its response arrives.
+      self.limiter.acquire()
+      response = error = None
+      try:
+        response = super().request(method, url, *args, **kwargs)
+      except (requests.ConnectionError, requests.Timeout) as e:
+        error = e
+      finally:
+        self.limiter.release(response)
+
+        # Always record, so a half-open trial never stays in flight.
+        self.breaker.record(response is None or self.retry.is_failure(response, error), trial)
+
+      if not self.retry.should_retry(method, url, response, error, attempt):
+        if error is not None:
+          raise error
+        return response
+
+      attempt += 1
+      status = response.status_code if response is not None else type(error).__name__
+      logger.info(f'Retrying {method} {url.split("?")[0]} after {status} (attempt {attempt + 1}).')
+      delay = self.retry.backoff(response, delay)
+
+
+class SessionPool:
+
+  def __init__(self) -> None:
+    self.sessions = {}
+    self.hits = 0
+    self.misses = 0
+    self.lock = threading.Lock()
+
+
+  def get(self, base_url: str, token: str, **options) -> CanvasSession:
+    key = (base_url.rstrip('/'), token)
+
+    with self.lock:
+      if key in self.sessions:
+        self.hits += 1
+        logger.debug(f'Reusing pooled session for {key[0]} ({self.hits} hits).')
+        return self.sessions[key]
+
+      # Report at exit. Registered late so it runs before logging stops.
+      if not self.sessions:
+        atexit.register(self.report)
+
+      self.misses += 1
+      session = self.sessions[key] = self.create(key[0], **options)
+      logger.debug(f'Created pooled session for {key[0]}.')
+      return session
+
+
+  def create(self, base_url: str, pool_size: int = 10, http2: bool = False, max_in_flight: int = 8,
+    retry_attempts: int = 5, cache: ResponseCache = None, decoder: str = 'auto') -> CanvasSession:
+    if http2:
+      self.enable_http2()
+
+    # Connections are kept alive by default, so one adapter per
+    # scheme is enough to reuse TCP and TLS state between requests.
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session = CanvasSession(
+      base_url,
+      RateLimiter(maximum=max_in_flight),
+      RetryPolicy(attempts=retry_attempts),
+      CircuitBreaker(),
+      cache,
+      JsonDecoder(decoder),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+  def enable_http2(self) -> None:
+    try:
+      # Requires urllib3 2.3 or later and the optional h2 package.
+      from urllib3.http2 import inject_into_urllib3
+      inject_into_urllib3()
+    except ImportError:
+      logger.warning('HTTP/2 requested but unavailable. Install h2 to enable it.')
+
+
+  def stats(self) -> dict:
+    connections = requests_sent = 0
+
+    with self.lock:
+      for session in self.sessions.values():
+        for adapter in set(session.adapters.values()):
+          manager = getattr(adapter, 'poolmanager', None)
+          if not manager:
+            continue
+          for key in manager.pools.keys():
+            if pool := manager.pools.get(key):
+              connections += pool.num_connections
+              requests_sent += pool.num_requests
+
+      return {
+        'sessions': len(self.sessions),
+        'session_hits': self.hits,
+        'session_misses': self.misses,
+        'connections': connections,
+        'requests': requests_sent,
+        # Every request beyond the first on a connection skipped a handshake.
+        'connection_reuses': max(requests_sent - connections, 0),
+      }
+
+
+  def report(self) -> None:
+    if self.sessions:
+      logger.info('Session pool stats: ' + ', '.join(f'{k}={v}' for k, v in self.stats().items()))
+    for (url, _), session in self.sessions.items():
+      logger.info(f'Rate limiter stats for {url}: ' + ', '.join(f'{k}={v}' for k, v in session.limiter.stats().items()))
+      logger.info(f'Retry stats for {url}: ' + ', '.join(f'{k}={v}' for k, v in session.retry.stats().items())
+        + f', circuit_trips={session.breaker.trips}')
+
+
+  def close(self) -> None:
+    with self.lock:
+      for session in self.sessions.values():
+        session.close()
+      self.sessions.clear()
+
+
+# Process-wide pool shared by every CourseManager.
+session_pool = SessionPool()
@@ -1,10 +1,15 @@
 import re
 import json
+import time
 import uuid
 import click
+import asyncio
+import hashlib
 import urllib.parse
 
 from os import path
+from canvas.qti import QtiPackage
+from canvas.sessionjournal import SessionJournal
 from canvas import ConfigManager, CourseManager
 
 ###########################################################################
@@ -26,6 +31,14 @@ def validate_figure_paths(questions):
       [validate_path(a.get('figure_path')) for a in q['answers']]
 
 
+def get_figure_paths(questions):
+  # Only questions with answers are added to the quiz.
+  for q in questions:
+    if 'answers' not in q:
+      continue
+    yield from filter(None, [q.get('figure_path'), *[a.get('figure_path') for a in q['answers']]])
+
+
 # Latex conversion
 def latexrepl(match):
   if isinstance(match, re.Match):
@@ -45,17 +58,84 @@ def latex(text):
   return p.sub(latexrepl, text)
 
 
-def upload_figure(folder, abs_path, dry_run = False):
-    if not folder or not abs_path:
-      return ''
-    if dry_run:
-      return f'<fig="{abs_path}" />'
-    is_uploaded, response = folder.upload(abs_path)
-    if not is_uploaded:
-      raise IOError(f'Upload failed for figure {abs_path}')
-    print(f'Figure {response["filename"]} uploaded.')
-    url = response['preview_url'].split('?')[0].replace('file_', '')
-    return f'<img id="{response["id"]}" src="{url}" alt="" />'
+def figure_tag(figures, abs_path):
+  return figures.get(abs_path, '') if abs_path else ''
+
+
+# Build the Canvas API payload for one generated question.
+def compile_question(q, figures):
+  q_figure = figure_tag(figures, q.get('figure_path'))
+
+  question = {
+    'question_name': q['name'],
+    'question_text': latex(q['text']).replace('{figure}', q_figure),
+    'question_type': q['type'],
+    'points_possible': q['points'],
+    'answers': [],
+  }
+
+  if q.get('distractors'):
+    question['matching_answer_incorrect_matches'] = '\n'.join(q['distractors'])
+
+  for a in q['answers']:
+    answer = {}
+
+    a_figure = figure_tag(figures, a.get('figure_path'))
+
+    # Multiple question types
+    if 'text' in a:
+      text_types = ['fill_in_multiple_blanks_question', 'multiple_dropdowns_question']
+      key = 'answer_text' if q['type'] in text_types else 'answer_html'
+      answer[key] = a['text'] if q['type'] in text_types else latex(a['text']).replace('{figure}', a_figure)
+
+    if 'weight' in a:
+      answer['answer_weight'] = 100 if a['weight'] > 0 else 0
+
+    if a.get('comment'):
+      answer['answer_comment_html'] = latex(a['comment'])
+
+    # Matching questions
+    if 'left' in a:
+      answer['answer_match_left_html'] = latex(a['left']).replace('{figure}', a_figure)
+
+    if 'right' in a:
+      answer['answer_match_right'] = a['right']
+
+    # Dropdown questions
+    if 'blank_id' in a:
+      answer['blank_id'] = a['blank_id']
+
+    # Numerical questions
+    if 'type' in a:
+      answer['numerical_answer_type'] = a['type']
+
+    if 'numerics' not in a:
+      question['answers'].append(answer)
+      continue
+
+    n = a['numerics']
+
+    if 'exact' in n:
+      answer['answer_exact'] = n['exact']
+
+    if 'error_margin' in n:
+      answer['answer_error_margin'] = n['error_margin']
+
+    if 'approximate' in n:
+      answer['answer_approximate'] = n['approximate']
+
+    if 'precision' in n:
+      answer['answer_precision'] = n['precision']
+
+    if 'range_start' in n:
+      answer['answer_range_start'] = n['range_start']
+
+    if 'range_end' in n:
+      answer['answer_range_end'] = n['range_end']
+
+    question['answers'].append(answer)
+
+  return question
 
 
 # Gather command line arguments from MATLAB.
@@ -65,7 +145,11 @@ def upload_figure(folder, abs_path, dry_run = False):
 @click.option('--delete-quiz', is_flag=True, help='Delete the quiz after uploading questions.')
 @click.option('--dry-run', is_flag=True, help='Test process but do not upload to Canvas.')
 @click.option('--question-limit', type=int, default=-1, help='Limit on how many questions to add.')
-def cli(course_name, data_path, delete_quiz, dry_run, question_limit):
+@click.option('--qti', is_flag=True, help='Upload questions as one QTI package through a content migration.')
+@click.option('--qti-out', type=click.Path(dir_okay=False), help='Write a QTI package to this path without contacting Canvas.')
+@click.option('--sync-quiz', type=int, help='Update the quiz with this ID, changing only questions that differ.')
+@click.option('--resume', is_flag=True, help='Continue the last interrupted upload of this data file.')
+def cli(course_name, data_path, delete_quiz, dry_run, question_limit, qti, qti_out, sync_quiz, resume):
   """Canvas Mastery Toolkit CLI.
 
   MATLAB Quiz Generator Sidecar.
@@ -73,11 +157,14 @@ def cli(course_name, data_path, delete_quiz, dry_run, question_limit):
   \b
   COURSE_NAME is the name of a Canvas course entry.
   DATA_PATH is the absolute path to a .json data file."""
+  if sync_quiz and (qti or qti_out):
+    raise click.UsageError('--sync-quiz cannot be combined with --qti or --qti-out.')
+
   config = ConfigManager()
 
-  # Connect to Canvas course.
-  manager = CourseManager(config.get_course(course_name))
-  course = manager.get_course()
+  # Connect to Canvas course, unless only writing a package.
+  manager = CourseManager(config.get_course(course_name)) if not qti_out else None
+  course = manager.get_course() if manager else None
 
   limit = f'a limit of {question_limit}' if question_limit > 0 else 'no limit'
   print(f'Using file {data_path} with {limit}')
@@ -99,7 +186,21 @@ def cli(course_name, data_path, delete_quiz, dry_run, question_limit):
 
   print('Figures:', has_figures)
 
-  folder = manager.get_folder() if has_figures else None
+  # Packaged figures are imported with the package rather than uploaded.
+  title = data.get('title') or f'Generated Quiz {uuid.uuid4()}'
+  package = QtiPackage(title, data.get('description', '')) if qti or qti_out else None
+
+  # Record the quiz, figures and questions as they are uploaded.
+  journal = None
+  if not dry_run and not package:
+    journal = SessionJournal(f'{path.splitext(data_path)[0]}.journal.json', resume)
+    fingerprint = hashlib.sha256(json.dumps([data, question_limit], sort_keys=True).encode()).hexdigest()
+    if journal.get('data', fingerprint) != fingerprint:
+      print('The data file changed since the interrupted upload. Starting over with a new quiz.')
+      journal.clear()
+    journal.record('data', fingerprint)
+
+  folder = manager.get_folder() if has_figures and not package else None
 
   print('Folder:', folder)
 
@@ -107,19 +208,46 @@ def cli(course_name, data_path, delete_quiz, dry_run, question_limit):
   if has_figures:
     validate_figure_paths(data['questions'])
 
-  # Create a blank quiz.
-  if not dry_run:
+  # Prepare every figure up front, uploading each file once and concurrently.
+  figures = {}
+  if has_figures:
+    limited = data['questions'][:question_limit] if question_limit > 0 else data['questions']
+    if dry_run:
+      figures = {abs_path: f'<fig="{abs_path}" />' for abs_path in get_figure_paths(limited)}
+    elif package:
+      figures = {abs_path: package.add_figure(abs_path) for abs_path in get_figure_paths(limited)}
+    elif 'figures' in journal:
+      figures = journal.get('figures')
+      print(f'Reusing {len(figures)} figures uploaded before the interruption.')
+    else:
+      figures = journal.record('figures', manager.get_figure_registry(folder).upload(get_figure_paths(limited)))
+
+  # Reuse the interrupted or given quiz, or create a blank one.
+  resumed = bool(journal and journal.get('quiz'))
+  if resumed:
+    quiz = course.get_quiz(journal.get('quiz'))
+
+    print('Quiz (resumed):', quiz)
+  elif sync_quiz:
+    quiz = course.get_quiz(sync_quiz)
+    if journal:
+      journal.record('quiz', quiz.id)
+
+    print('Quiz:', quiz)
+  elif not dry_run and not package:
     quiz = course.create_quiz({
-      'title': data.get('title') or f'Generated Quiz {uuid.uuid4()}',
+      'title': title,
       'description': data.get('description', ''),
       'quiz_type': 'assignment',
       'shuffle_answers': False,
     })
+    journal.record('quiz', quiz.id)
 
     print('Quiz:', quiz)
 
-  # Keep running total of the quiz points.
-  total_points = 0
+  # Questions are posted together once they are all prepared.
+  questions = []
+  failures = {}
 
   # Iterate over data to prepare for Canvas API.
   for count, q in enumerate(data['questions']):
@@ -132,95 +260,98 @@ def cli(course_name, data_path, delete_quiz, dry_run, question_limit):
       print('Skipping question without answers.')
       continue
 
-    # Upload file first to get an image tag.
-    q_figure = upload_figure(folder, q.get('figure_path'), dry_run)
-
-    question = {
-      'question_name': q['name'],
-      'question_text': latex(q['text']).replace('{figure}', q_figure),
-      'question_type': q['type'],
-      'points_possible': q['points'],
-      'answers': [],
-    }
-
-    total_points += q['points']
-
-    if q.get('distractors'):
-      question['matching_answer_incorrect_matches'] = '\n'.join(q['distractors'])
-
-    for a in q['answers']:
-      answer = {}
-
-      a_figure = upload_figure(folder, a.get('figure_path'), dry_run)
-
-      # Multiple question types
-      if 'text' in a:
-        text_types = ['fill_in_multiple_blanks_question', 'multiple_dropdowns_question']
-        key = 'answer_text' if q['type'] in text_types else 'answer_html'
-        answer[key] = a['text'] if q['type'] in text_types else latex(a['text']).replace('{figure}', a_figure)
-
-      if 'weight' in a:
-        answer['answer_weight'] = 100 if a['weight'] > 0 else 0
-
-      if a.get('comment'):
-        answer['answer_comment_html'] = latex(a['comment'])
+    question = compile_question(q, figures)
 
-      # Matching questions
-      if 'left' in a:
-        answer['answer_match_left_html'] = latex(a['left']).replace('{figure}', a_figure)
-
-      if 'right' in a:
-        answer['answer_match_right'] = a['right']
-
-      # Dropdown questions
-      if 'blank_id' in a:
-        answer['blank_id'] = a['blank_id']
-
-      # Numerical questions
-      if 'type' in a:
-        answer['numerical_answer_type'] = a['type']
-
-      if 'numerics' not in a:
-        question['answers'].append(answer)
-        continue
-
-      n = a['numerics']
+    if dry_run:
+      print(question)
+      continue
 
-      if 'exact' in n:
-        answer['answer_exact'] = n['exact']
+    questions.append(question)
 
-      if 'error_margin' in n:
-        answer['answer_error_margin'] = n['error_margin']
+  if package and not dry_run:
+    # The whole bank goes to Canvas as one file and one import.
+    for question in questions:
+      package.add_question(question)
+    package_path = package.write(qti_out or f'{path.splitext(data_path)[0]}.qti.zip')
+    print(f'Wrote {len(questions)} questions and {len(package.files)} figures to {package_path}')
 
-      if 'approximate' in n:
-        answer['answer_approximate'] = n['approximate']
+    if not qti_out:
+      manager.import_qti(course, package_path, settings={'question_bank_name': title})
+      print('Questions uploaded.')
 
-      if 'precision' in n:
-        answer['answer_precision'] = n['precision']
+      # The import creates a quiz with the package's title.
+      quiz = max((q for q in course.get_quizzes(search_term=title) if q.title == title), key=lambda q: q.id, default=None)
 
-      if 'range_start' in n:
-        answer['answer_range_start'] = n['range_start']
+      # Remember the imported questions, so a later sync only changes what differs.
+      imported = sorted(quiz.get_questions(), key=lambda q: getattr(q, 'position', None) or 0) if quiz else []
+      if len(imported) == len(questions):
+        manager.get_quiz_sync(quiz).record(list(zip(imported, questions)))
 
-      if 'range_end' in n:
-        answer['answer_range_end'] = n['range_end']
+  elif sync_quiz and not dry_run:
+    # Only write the questions whose payloads differ from what the quiz has.
+    started = time.monotonic()
+    quiz_sync = manager.get_quiz_sync(quiz)
+    plan = quiz_sync.plan(questions)
+    failures = quiz_sync.apply(plan)
+    elapsed = time.monotonic() - started
 
-      question['answers'].append(answer)
+    labels = {'keep': 'unchanged', 'move': 'moved', 'update': 'updated', 'create': 'created', 'delete': 'deleted'}
+    counts = ', '.join(f'{len(plan[action])} {label}' for action, label in labels.items())
+    print(f'Questions {counts} in {elapsed:.2f} seconds.')
 
-    if dry_run or not quiz:
-      print(question)
-      continue
+    for position, error in failures.items():
+      print(f'Failed to sync question {position}: {error}')
 
-    # Post the quiz.
-    quiz.create_question(question=question)
+    # Update total points for the quiz.
+    quiz.edit(quiz={'points_possible': sum(q['points_possible'] for q in questions)})
+    print('Questions synced.')
+
+  elif not dry_run:
+    # Questions created before an interruption keep their positions,
+    # including any the journal missed because the run stopped first.
+    created = set(journal.get('created', []))
+    if resumed:
+      created |= {q.position for q in quiz.get_questions() if getattr(q, 'position', None)}
+    if created:
+      print(f'Skipping {len(created)} questions created before the interruption.')
+
+    # Created questions are remembered, so a later sync only changes what differs.
+    quiz_sync = manager.get_quiz_sync(quiz)
+
+    def done(position, result):
+      created.add(position)
+      journal.record('created', sorted(created))
+      quiz_sync.record([(result, questions[position - 1])])
+
+    # Post the questions concurrently, collecting failures instead of stopping.
+    started = time.monotonic()
+    client = manager.get_async_client()
+    results = asyncio.run(client.create_questions(quiz, questions, skip=created, done=done))
+    elapsed = time.monotonic() - started
+
+    failures = {position: result for position, result in results.items() if isinstance(result, Exception)}
+    created = len(results) - len(failures)
+    rate = created / elapsed if elapsed else 0
+    print(f'Created {created} questions in {elapsed:.2f} seconds ({rate:.1f} per second).')
+
+    for position, error in failures.items():
+      print(f'Failed to create question {position} ({questions[position - 1]["question_name"]}): {error}')
 
-  if not dry_run:
     # Update total points for the quiz.
+    total_points = sum(q['points_possible'] for i, q in enumerate(questions, 1) if i not in failures)
     quiz.edit(quiz={'points_possible': total_points})
     print('Questions uploaded.')
 
 
+  # Failed questions are retried by resuming, and nothing else is left to do.
+  if journal and failures:
+    print('Run again with --resume to retry the failed questions.')
+  elif journal:
+    journal.clear()
+
+
   # Delete the quiz, leaving the questions in the "Unfiled" bank.
-  if not dry_run and delete_quiz:
+  if not dry_run and not qti_out and delete_quiz and quiz:
     quiz.delete()
     print('Quiz deleted.')
 
@@ -0,0 +1,95 @@
+import gc
+import click
+import tracemalloc
+
+from canvasapi.requester import Requester
+from canvasapi.submission import Submission
+from canvasapi.outcome import OutcomeResult
+from canvas.projections import OutcomeScore, SubmissionScore
+
+###########################################################################
+# PROJECTION BENCHMARK
+# Run from the repository root: python -m tools.bench_projections
+###########################################################################
+
+
+# Synthetic records, shaped like the Canvas API responses they stand in for.
+def make_submissions(count):
+  return [{
+    'id': i,
+    'user_id': 10000 + i % 500,
+    'assignment_id': 100 + i // 500,
+    'score': float(i % 10),
+    'grade': str(i % 10),
+    'attempt': 1,
+    'workflow_state': 'graded',
+    'submission_type': 'online_quiz',
+    'submitted_at': '2024-02-01T12:00:00Z',
+    'graded_at': '2024-02-02T12:00:00Z',
+    'grader_id': 1,
+    'late': False,
+    'missing': False,
+    'excused': None,
+    'preview_url': f'https://canvas.example.com/courses/1/assignments/{100 + i // 500}/submissions/{i}?preview=1',
+  } for i in range(count)]
+
+
+def make_outcome_results(count):
+  return [{
+    'id': i,
+    'score': float(i % 4),
+    'possible': 3.0,
+    'percent': (i % 4) / 3,
+    'mastery': i % 4 >= 3,
+    'hidden': False,
+    'submitted_or_assessed_at': '2024-02-01T12:00:00Z',
+    'links': {
+      'user': str(10000 + i % 500),
+      'learning_outcome': str(200 + i % 30),
+      'alignment': f'assignment_{100 + i // 500}',
+    },
+  } for i in range(count)]
+
+
+def measure(build, records):
+  gc.collect()
+  tracemalloc.start()
+  built = [build(record) for record in records]
+  retained, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  del built
+  return retained, peak
+
+
+@click.command()
+@click.option('--count', type=int, default=50000, show_default=True, help='Number of synthetic records of each kind.')
+def cli(count):
+  """Compare the memory of full canvasapi objects against projections.
+
+  Building canvasapi objects is slow, since each string is tried as a date,
+  so the default run takes several minutes.
+  """
+  requester = Requester('https://canvas.example.com', 'token')
+
+  cases = [
+    ('submissions', make_submissions, [
+      ('Submission', lambda data: Submission(requester, data)),
+      ('SubmissionScore', SubmissionScore),
+    ]),
+    ('outcome results', make_outcome_results, [
+      ('OutcomeResult', lambda data: OutcomeResult(requester, data)),
+      ('OutcomeScore', OutcomeScore),
+    ]),
+  ]
+
+  print(f'{"Records":<16}{"Class":<18}{"Retained MiB":>14}{"Peak MiB":>10}')
+  for label, make, builds in cases:
+    records = make(count)
+    for name, build in builds:
+      # Each build gets fresh dicts, since canvasapi keeps a reference to them.
+      retained, peak = measure(build, [dict(record) for record in records])
+      print(f'{label:<16}{name:<18}{retained / 2 ** 20:>14.1f}{peak / 2 ** 20:>10.1f}')
+
+
+if __name__ == '__main__':
+  cli()